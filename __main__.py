@@ -0,0 +1,4 @@
+# Точка входа для запуска каталога проекта: python arbitration-checker
+from main import main_app
+
+main_app()
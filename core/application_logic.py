@@ -1,19 +1,17 @@
-
-import os
 import logging
 import csv
-import json
+import orjson
 import datetime
-import sys # Добавлен импорт sys для манипуляции путем импорта
+import itertools
+import re
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 
 # Импорт компонентов
-# Динамическая настройка пути Python для возможности импорта модулей из структуры проекта.
-# Этот путь относится к месту расположения этого скрипта (application_logic.py).
-current_script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root_for_imports = os.path.abspath(os.path.join(current_script_dir, '..'))
-if project_root_for_imports not in sys.path:
-    sys.path.insert(0, project_root_for_imports)
-
+# Модули проекта импортируются относительно корня проекта, который добавляется
+# в путь поиска точкой входа (main.py) или тестовым окружением.
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from psycopg2 import OperationalError
 from scraper.arbitr_scraper import ArbitrScraper
 from database.db_manager import DBManager
 from utils.logger import setup_logging 
@@ -21,6 +19,31 @@ from utils.logger import setup_logging
 # Настройка логирования для ApplicationLogic с использованием функции setup_logging
 logger = setup_logging()
 
+# Формат ИНН: ровно 10 (юридические лица) или 12 (физические лица) цифр
+_INN_FORMAT_MATCH = re.compile(r'(?:[0-9]{10}|[0-9]{12})\Z').match
+# Весовые коэффициенты контрольных цифр ИНН
+_INN10_COEFS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_COEFS_11 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_COEFS_12 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+def _inn_checksum(digits, coefs):
+    """Вычисляет контрольную цифру ИНН.
+
+    Args:
+        digits (tuple): Цифры ИНН, предшествующие контрольной.
+        coefs (tuple): Весовые коэффициенты той же длины.
+
+    Returns:
+        int: Ожидаемая контрольная цифра.
+    """
+    return sum(d * c for d, c in zip(digits, coefs)) % 11 % 10
+
+# Порядок столбцов при экспорте; совпадает с порядком столбцов, выдаваемых DBManager.iter_all_cases
+EXPORT_FIELDNAMES = ('case_number', 'case_date', 'inn')
+
+# Размер буфера файла экспорта: строки пишутся мелкими порциями, а на диск уходят блоками по 1 МБ
+EXPORT_BUFFER_SIZE = 1 << 20
+
 class ApplicationLogic:
     """Класс ApplicationLogic координирует работу GUI, Scraper и DBManager.
 
@@ -28,19 +51,23 @@ class ApplicationLogic:
     получение данных, сохранение их в БД через DBManager и обновление статуса в GUI.
     Также включает функционал фильтрации и экспорта данных.
     """
-    def __init__(self, scraper: ArbitrScraper, db_manager: DBManager, gui_status_updater, gui_results_updater):
+    def __init__(self, scraper: ArbitrScraper, db_manager: DBManager, gui_status_updater, gui_results_updater, gui_cases_appender=None):
         """Инициализирует ApplicationLogic с зависимостями.
 
         Args:
             scraper (ArbitrScraper): Экземпляр веб-скрапера.
             db_manager (DBManager): Экземпляр менеджера базы данных.
             gui_status_updater (callable): Метод GUI для обновления текстового статуса.
-            gui_results_updater (callable): Метод GUI для обновления таблицы QTableWidget.
+            gui_results_updater (callable): Метод GUI для замены содержимого таблицы результатов.
+            gui_cases_appender (callable, optional): Метод GUI для добавления пачки дел в таблицу
+                                                     по мере их извлечения скрапером.
         """
         self.scraper = scraper
         self.db_manager = db_manager
         self.gui_status_updater = gui_status_updater # Метод GUI для обновления текстового статуса
-        self.gui_results_updater = gui_results_updater # Метод GUI для обновления QTableWidget
+        self.gui_results_updater = gui_results_updater # Метод GUI для обновления таблицы результатов
+        self.gui_cases_appender = gui_cases_appender # Метод GUI для добавления найденных дел пачками
+        self.save_batch_size = 50 # Размер пачки дел, выводимой в GUI и сохраняемой в БД во время скрапинга
         logger.info("ApplicationLogic инициализирован.")
 
     def _update_status(self, message, level=logging.INFO):
@@ -59,68 +86,140 @@ class ApplicationLogic:
         else:
             logger.info(message)
 
+    @staticmethod
+    def _is_valid_inn(inn):
+        """Проверяет ИНН: 10 или 12 цифр и совпадение контрольных цифр.
+
+        Args:
+            inn (str): ИНН для проверки.
+
+        Returns:
+            bool: True, если ИНН корректен, иначе False.
+        """
+        if not inn or not _INN_FORMAT_MATCH(inn):
+            return False
+        digits = tuple(map(int, inn))
+        if len(digits) == 10:
+            return _inn_checksum(digits, _INN10_COEFS) == digits[9]
+        return (_inn_checksum(digits, _INN12_COEFS_11) == digits[10]
+                and _inn_checksum(digits, _INN12_COEFS_12) == digits[11])
+
     def start_scraping(self, inn: str):
         """Координирует скрапинг и сохранение арбитражных дел.
 
         Args:
             inn (str): ИНН для поиска арбитражных дел.
         """
+        # 1. Валидация ИНН до любых других действий
+        if not self._is_valid_inn(inn):
+            self._update_status("Ошибка: Неверный ИНН. Пожалуйста, введите корректный ИНН (только цифры, 10 или 12 знаков, с верными контрольными цифрами).", level=logging.ERROR)
+            return
+
         self._update_status(f"Запускаю скрапинг для ИНН: {inn}...")
 
-        # 1. Валидация ИНН
-        if not inn or not inn.isdigit() or len(inn) not in [10, 12]:
-            self._update_status("Ошибка: Неверный ИНН. Пожалуйста, введите корректный ИНН (только цифры, 10 или 12 знаков).", level=logging.ERROR)
-            return
+        # Дела обрабатываются по мере извлечения скрапером: пачками по save_batch_size
+        # добавляются в таблицу GUI и сохраняются в БД, без буферизации полного списка.
+        found_count = 0
+        seen_case_numbers = set()
+        pending_cases = []
+        save_futures = []
+        # Без вывода пачками в GUI таблица обновляется одним списком в конце
+        collected_cases = None if self.gui_cases_appender else []
+        # Пачки записываются в БД отдельным потоком, чтобы скрапер не ждал вставки;
+        # единственный поток записи сохраняет пачки по очереди в порядке поступления
+        db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+
+        def flush_pending_cases():
+            if not pending_cases:
+                return
+            # Копия пачки: сигнал GUI и поток записи получают список уже после очистки буфера
+            batch = list(pending_cases)
+            pending_cases.clear()
+            if self.gui_cases_appender:
+                self.gui_cases_appender(batch)
+            save_futures.append(db_writer.submit(self._save_cases, batch))
 
-        scraped_cases = []
-        # 2. Скрапинг дел
+        def on_case(case):
+            nonlocal found_count
+            # Повторы одного дела (перекрытие страниц, повторные попытки) отбрасываются до вставки в БД
+            if case['case_number'] in seen_case_numbers:
+                return
+            seen_case_numbers.add(case['case_number'])
+            found_count += 1
+            if collected_cases is not None:
+                collected_cases.append(case)
+            pending_cases.append(case)
+            if len(pending_cases) >= self.save_batch_size:
+                flush_pending_cases()
+
+        # 2. Скрапинг дел с сохранением по ходу
         try:
             self._update_status("Начинаю процесс веб-скрапинга...")
-            scraped_cases = self.scraper.scrape_arbitr_cases(inn)
-            if not scraped_cases:
+            if self.gui_results_updater and self.gui_cases_appender:
+                self.gui_results_updater([])
+            self.scraper.scrape_arbitr_cases(inn, on_case=on_case)
+            if not found_count:
                 self._update_status(f"Скрапинг завершен. Новые дела для ИНН {inn} не найдены или произошла ошибка.")
             else:
-                self._update_status(f"Скрапинг завершен. Найдено {len(scraped_cases)} дел для ИНН {inn}.")
+                self._update_status(f"Скрапинг завершен. Найдено {found_count} дел для ИНН {inn}.")
         except TimeoutException:
             self._update_status("Ошибка: Сайт недоступен или слишком долго отвечает. Попробуйте еще раз позже.", level=logging.ERROR)
             logger.exception("Таймаут во время скрапинга.")
-            return
         except WebDriverException as e:
             self._update_status(f"Ошибка WebDriver: {e}. Возможно, проблема с настройкой Chrome/ChromeDriver или превышено количество запросов.", level=logging.ERROR)
             logger.exception("Ошибка WebDriver во время скрапинга.")
-            return
         except Exception as e:
             self._update_status(f"Неожиданная ошибка во время скрапинга: {e}.", level=logging.ERROR)
             logger.exception("Неожиданная ошибка во время скрапинга.")
-            return
 
-        # 3. Обновление таблицы результатов GUI
-        if self.gui_results_updater:
+        # 3. Сохранение оставшихся дел (в том числе найденных до ошибки скрапинга)
+        # и ожидание записи всех пачек
+        flush_pending_cases()
+        db_writer.shutdown(wait=True)
+        # _save_cases не выбрасывает исключений и возвращает None при ошибке
+        inserted_counts = [future.result() for future in save_futures]
+        save_failed = None in inserted_counts
+        inserted_total = sum(count for count in inserted_counts if count is not None)
+
+        # 4. Обновление таблицы результатов GUI, если дела не выводились пачками
+        if collected_cases is not None and self.gui_results_updater:
             self._update_status("Обновляю таблицу результатов GUI...")
-            self.gui_results_updater(scraped_cases)
-
-        # 4. Сохранение дел в базу данных
-        if scraped_cases:
-            self._update_status("Сохраняю полученные дела в базу данных...")
-            inserted_count = 0
-            try:
-                # Сначала убедимся, что таблица существует 
-                self.db_manager.create_table()
-                for case in scraped_cases:
-                    if self.db_manager.insert_case(case['case_number'], case['case_date'], case['inn']):
-                        inserted_count += 1
-                self._update_status(f"Успешно вставлено {inserted_count} новых дел (пропущены существующие).", level=logging.INFO)
-            except OperationalError as e:
-                self._update_status(f"Ошибка подключения к базе данных: {e}. Проверьте настройки и запущен ли PostgreSQL.", level=logging.ERROR)
-                logger.exception("Ошибка операции с базой данных во время сохранения.")
-            except Exception as e:
-                self._update_status(f"Ошибка при сохранении дел в базу данных: {e}.", level=logging.ERROR)
-                logger.exception("Ошибка сохранения дел в базу данных.")
+            self.gui_results_updater(collected_cases)
+
+        if save_failed:
+            self._update_status("Часть дел не удалось сохранить в базу данных. Подробности в журнале.", level=logging.ERROR)
+        elif found_count:
+            self._update_status(f"Успешно вставлено {inserted_total} новых дел (пропущены существующие).")
         else:
             self._update_status(f"Нет новых дел для сохранения для ИНН {inn}.")
 
         self._update_status("Процесс скрапинга и обновления базы данных завершен.")
 
+    def _save_cases(self, cases):
+        """Сохраняет пачку дел в базу данных одним пакетным запросом.
+
+        Вызывается в потоке записи start_scraping. Таблица создается один раз
+        при запуске приложения (main.py).
+
+        Args:
+            cases (list): Список словарей дел.
+
+        Returns:
+            int or None: Количество вставленных дел или None при ошибке.
+        """
+        try:
+            inserted_count = self.db_manager.insert_cases_bulk(cases)
+            if inserted_count is None:
+                self._update_status("Ошибка при сохранении дел в базу данных. Подробности в журнале.", level=logging.ERROR)
+            return inserted_count
+        except OperationalError as e:
+            self._update_status(f"Ошибка подключения к базе данных: {e}. Проверьте настройки и запущен ли PostgreSQL.", level=logging.ERROR)
+            logger.exception("Ошибка операции с базой данных во время сохранения.")
+        except Exception as e:
+            self._update_status(f"Ошибка при сохранении дел в базу данных: {e}.", level=logging.ERROR)
+            logger.exception("Ошибка сохранения дел в базу данных.")
+        return None
+
     def filter_cases(self, case_number_filter=None, inn_filter=None, start_date=None, end_date=None):
         """Извлекает и отображает отфильтрованные дела в таблице GUI.
 
@@ -131,6 +230,14 @@ class ApplicationLogic:
             end_date (str, optional): Конечная дата (ГГГГ-ММ-ДД) для фильтрации по дате дела.
         """
         self._update_status("Применяю фильтры и обновляю таблицу...")
+        # Даты передаются в БД как datetime.date, а не как строки
+        try:
+            start_date = datetime.date.fromisoformat(start_date) if start_date else None
+            end_date = datetime.date.fromisoformat(end_date) if end_date else None
+        except ValueError:
+            self._update_status("Ошибка: Неверный формат даты. Используйте ГГГГ-ММ-ДД.", level=logging.ERROR)
+            return
+
         try:
             filtered_cases = self.db_manager.get_filtered_cases_as_dicts(
                 case_number_filter, inn_filter, start_date, end_date
@@ -145,6 +252,9 @@ class ApplicationLogic:
     def export_data_to_csv(self, file_path: str):
         """Экспортирует все сохраненные дела в файл CSV.
 
+        Строки читаются из БД потоково и сразу записываются в файл,
+        поэтому весь набор дел не загружается в память.
+
         Args:
             file_path (str): Путь к файлу CSV для сохранения данных.
 
@@ -153,22 +263,18 @@ class ApplicationLogic:
         """
         self._update_status(f"Экспортирую данные в CSV: {file_path}...")
         try:
-            cases = self.db_manager.get_all_cases_as_dicts()
-            if not cases:
-                self._update_status("Нет данных для экспорта в CSV.", level=logging.WARNING)
-                return False
-
-            # Убедитесь, что case_date является строкой для совместимости с CSV
-            for case in cases:
-                if isinstance(case.get('case_date'), datetime.date):
-                    case['case_date'] = case['case_date'].isoformat()
-
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['case_number', 'case_date', 'inn']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-                writer.writeheader()
-                writer.writerows(cases)
+            with closing(self.db_manager.iter_all_cases()) as rows:
+                first_row = next(rows, None)
+                if first_row is None:
+                    self._update_status("Нет данных для экспорта в CSV.", level=logging.WARNING)
+                    return False
+
+                with open(file_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                    writer = csv.writer(f)
+                    writer.writerow(EXPORT_FIELDNAMES)
+                    # Строки курсора передаются в writerows как есть: csv.writer сам приводит
+                    # datetime.date к строке ISO 8601 (YYYY-MM-DD), а None к пустому полю
+                    writer.writerows(itertools.chain((first_row,), rows))
             self._update_status(f"Данные успешно экспортированы в CSV: {file_path}")
             return True
         except Exception as e:
@@ -179,6 +285,9 @@ class ApplicationLogic:
     def export_data_to_json(self, file_path: str):
         """Экспортирует все сохраненные дела в файл JSON.
 
+        Массив JSON записывается по одному элементу за раз по мере чтения строк из БД,
+        без построения полного списка дел в памяти.
+
         Args:
             file_path (str): Путь к файлу JSON для сохранения данных.
 
@@ -187,22 +296,24 @@ class ApplicationLogic:
         """
         self._update_status(f"Экспортирую данные в JSON: {file_path}...")
         try:
-            cases = self.db_manager.get_all_cases_as_dicts()
-            if not cases:
-                self._update_status("Нет данных для экспорта в JSON.", level=logging.WARNING)
-                return False
-
-            # Убедитесь, что case_date является строкой для сериализации в JSON
-            for case in cases:
-                if isinstance(case.get('case_date'), datetime.date):
-                    case['case_date'] = case['case_date'].isoformat()
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(cases, f, ensure_ascii=False, indent=4)
+            with closing(self.db_manager.iter_all_cases()) as rows:
+                first_row = next(rows, None)
+                if first_row is None:
+                    self._update_status("Нет данных для экспорта в JSON.", level=logging.WARNING)
+                    return False
+
+                # orjson сериализует datetime.date нативно и сразу выдает байты UTF-8
+                with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+                    f.write(b'[')
+                    separator = b'\n    '
+                    for case_number, case_date, inn in itertools.chain((first_row,), rows):
+                        f.write(separator)
+                        f.write(orjson.dumps({'case_number': case_number, 'case_date': case_date, 'inn': inn}))
+                        separator = b',\n    '
+                    f.write(b'\n]')
             self._update_status(f"Данные успешно экспортированы в JSON: {file_path}")
             return True
         except Exception as e:
             self._update_status(f"Ошибка при экспорте в JSON: {e}", level=logging.ERROR)
             logger.exception("Ошибка экспорта в JSON.")
             return False
-
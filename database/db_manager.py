@@ -1,102 +1,330 @@
 
-import psycopg2
 from psycopg2 import OperationalError, Error
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from psycopg2.extras import execute_values, RealDictCursor
 import configparser
 import os
 import logging
-import datetime 
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from utils.logger import setup_logging 
 
 # Настройка логирования для DBManager
 logger = setup_logging()
 
+# Серверные подготовленные выражения для часто выполняемых запросов.
+# Создаются один раз на каждое соединение пула и переживают его возврат в пул.
+PREPARE_STATEMENTS_SQL = """
+    PREPARE insert_case_stmt (varchar, date, varchar) AS
+        INSERT INTO arbitration_cases (case_number, case_date, inn)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (case_number) DO NOTHING;
+    PREPARE case_exists_stmt (varchar) AS
+        SELECT 1 FROM arbitration_cases WHERE case_number = $1;
+"""
+
+@functools.lru_cache(maxsize=None)
+def _build_filter_query(by_case_number, by_inn, by_start_date, by_end_date, exact_inn=False):
+    """Собирает SQL-запрос фильтрации только из используемых условий.
+
+    Результат кэшируется: существует не более 32 вариантов запроса.
+
+    Args:
+        by_case_number (bool): Фильтровать по номеру дела.
+        by_inn (bool): Фильтровать по ИНН.
+        by_start_date (bool): Фильтровать по начальной дате.
+        by_end_date (bool): Фильтровать по конечной дате.
+        exact_inn (bool, optional): ИНН задан полностью - сравнение на равенство
+                                    (использует индекс (inn, case_date)) вместо ILIKE.
+
+    Returns:
+        str: SQL-запрос с параметрами-заполнителями %s в порядке перечисления условий.
+    """
+    conditions = []
+    if by_case_number:
+        conditions.append("case_number ILIKE %s")
+    if by_inn:
+        conditions.append("inn = %s" if exact_inn else "inn ILIKE %s")
+    if by_start_date:
+        conditions.append("case_date >= %s")
+    if by_end_date:
+        conditions.append("case_date <= %s")
+    sql_query = "SELECT case_number, case_date, inn FROM arbitration_cases"
+    if conditions:
+        sql_query += " WHERE " + " AND ".join(conditions)
+    return sql_query + ";"
+
+@dataclass(slots=True)
+class DbConfig:
+    """Параметры подключения к PostgreSQL, однократно прочитанные из секции [DATABASE]."""
+    host: str = 'localhost'
+    port: str = '5432'
+    dbname: str = 'arbitration_db'
+    user: str = 'postgres'
+    password: str = ''
+
+    @classmethod
+    def from_config(cls, config):
+        """Создает DbConfig из разобранного файла настроек.
+
+        Args:
+            config (configparser.ConfigParser): Загруженная конфигурация.
+
+        Returns:
+            DbConfig: Параметры подключения; отсутствующие значения заменяются значениями по умолчанию.
+        """
+        defaults = cls()
+        if not config.has_section('DATABASE'):
+            return defaults
+        section = config['DATABASE']
+        return cls(
+            host=section.get('host', defaults.host),
+            port=section.get('port', defaults.port),
+            dbname=section.get('dbname', defaults.dbname),
+            user=section.get('user', defaults.user),
+            password=section.get('password', defaults.password)
+        )
+
+    def connection_kwargs(self):
+        """Возвращает аргументы для psycopg2.connect / пула соединений.
+
+        Returns:
+            dict: Словарь с ключами host, port, database, user, password.
+        """
+        return {
+            'host': self.host,
+            'port': self.port,
+            'database': self.dbname,
+            'user': self.user,
+            'password': self.password
+        }
+
 class DBManager:
     """Класс для управления базой данных PostgreSQL.
 
     Отвечает за установление соединения с PostgreSQL, выполнение операций CRUD
     (Create, Read, Update, Delete) с данными арбитражных дел.
     """
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, config=None):
         """Инициализирует менеджер базы данных.
 
         Args:
             config_path (str, optional): Путь к файлу конфигурации settings.ini.
                                          Если не указан, используется путь по умолчанию.
+            config (dict or configparser.ConfigParser, optional): Готовая конфигурация.
+                                         Если передана, файл настроек не читается.
         """
-        self.config = configparser.ConfigParser()
-        if config_path:
+        if isinstance(config, configparser.ConfigParser):
+            self.config = config
+        elif config is not None:
+            self.config = configparser.ConfigParser()
+            self.config.read_dict(config)
+        elif config_path:
+            self.config = configparser.ConfigParser()
             self.config.read(config_path)
         else:
             # Путь по умолчанию относительно корня проекта для settings.ini
             default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.ini')
+            self.config = configparser.ConfigParser()
             self.config.read(default_config_path)
 
-        self.db_host = self.config.get('DATABASE', 'host', fallback='localhost')
-        self.db_port = self.config.get('DATABASE', 'port', fallback='5432')
-        self.db_name = self.config.get('DATABASE', 'dbname', fallback='arbitration_db')
-        self.db_user = self.config.get('DATABASE', 'user', fallback='postgres')
-        self.db_password = self.config.get('DATABASE', 'password', fallback='')
+        self.db_config = DbConfig.from_config(self.config)
+        self._conn_kwargs = self.db_config.connection_kwargs()
+        # Пул соединений создается лениво при первом обращении, чтобы конструктор
+        # не требовал доступной БД, и затем переиспользуется всеми методами.
+        self._pool = None
+        # Пул может впервые понадобиться одновременно нескольким фоновым задачам GUI
+        self._pool_lock = threading.Lock()
+        # Соединения пула, в сессии которых уже выполнены PREPARE_STATEMENTS_SQL
+        self._prepared_connections = weakref.WeakSet()
+        # LRU-кэш номеров дел, о существовании которых в БД уже известно.
+        # Кэшируются только положительные ответы: дела не удаляются, пока таблица не пересоздана.
+        self._known_cases = OrderedDict()
+        self._known_cases_lock = threading.Lock()
+        # Кэш текстов SQL-скриптов по пути и признак того, что таблица уже создана
+        self._sql_scripts = {}
+        self._table_ready = False
+        self.known_cases_max_size = 100_000
         logger.info("DBManager инициализирован.")
 
     def _get_connection(self):
-        """Устанавливает и возвращает соединение с базой данных PostgreSQL.
+        """Получает соединение с базой данных PostgreSQL из пула соединений.
+
+        При первом вызове создает пул `ThreadedConnectionPool`; последующие вызовы
+        переиспользуют уже открытые соединения вместо нового подключения к серверу.
 
         Returns:
             psycopg2.connection or None: Объект соединения, если успешно,
                                          иначе None.
         """
-        connection = None
         try:
-            connection = psycopg2.connect(
-                host=self.db_host,
-                port=self.db_port,
-                database=self.db_name,
-                user=self.db_user,
-                password=self.db_password
-            )
-            logger.info("Соединение с БД PostgreSQL успешно установлено.")
-            return connection
+            pool = self._pool
+            if pool is None:
+                with self._pool_lock:
+                    # Повторная проверка: пул мог создать другой поток, пока этот ждал блокировку
+                    if self._pool is None:
+                        self._pool = ThreadedConnectionPool(1, 10, **self._conn_kwargs)
+                        logger.info("Пул соединений с БД PostgreSQL успешно создан.")
+                    pool = self._pool
+            return pool.getconn()
         except OperationalError as e:
             logger.error(f"Ошибка подключения к базе данных: {e}")
             logger.error("Не удалось подключиться к базе данных. Проверьте settings.ini и убедитесь, что PostgreSQL запущен.")
             return None
+        except PoolError as e:
+            logger.error(f"Ошибка пула соединений с базой данных: {e}")
+            return None
+
+    def _put_connection(self, connection):
+        """Возвращает соединение в пул для повторного использования.
+
+        Args:
+            connection (psycopg2.connection): Соединение, полученное через `_get_connection`.
+        """
+        if self._pool is not None and not self._pool.closed:
+            self._pool.putconn(connection)
+        else:
+            connection.close()
+
+    @contextmanager
+    def _conn(self):
+        """Контекстный менеджер, выдающий соединение из пула и возвращающий его обратно.
+
+        Yields:
+            psycopg2.connection or None: Объект соединения или None, если подключиться не удалось.
+        """
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            if conn:
+                self._put_connection(conn)
 
-    def create_table(self, sql_script_path=None):
+    def _ensure_prepared(self, conn, cursor):
+        """Подготавливает выражения PREPARE_STATEMENTS_SQL в сессии соединения, если это еще не сделано.
+
+        Args:
+            conn (psycopg2.connection): Соединение из пула.
+            cursor (psycopg2.cursor): Курсор этого соединения.
+        """
+        if conn not in self._prepared_connections:
+            cursor.execute(PREPARE_STATEMENTS_SQL)
+            self._prepared_connections.add(conn)
+
+    def _remember_cases(self, case_numbers):
+        """Отмечает дела как существующие в БД в LRU-кэше `case_exists`.
+
+        Args:
+            case_numbers (iterable): Номера дел, которые гарантированно есть в таблице.
+        """
+        with self._known_cases_lock:
+            for case_number in case_numbers:
+                self._known_cases[case_number] = True
+                self._known_cases.move_to_end(case_number)
+            while len(self._known_cases) > self.known_cases_max_size:
+                self._known_cases.popitem(last=False)
+
+    def close(self):
+        """Закрывает все соединения пула. Следующий запрос создаст пул заново."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                logger.info("Пул соединений с БД PostgreSQL закрыт.")
+
+    def _read_sql_script(self, sql_script_path):
+        """Возвращает текст SQL-скрипта, читая файл только при первом обращении.
+
+        Args:
+            sql_script_path (str): Путь к SQL-скрипту.
+
+        Returns:
+            str or None: Текст скрипта или None, если файл не найден.
+        """
+        sql_commands = self._sql_scripts.get(sql_script_path)
+        if sql_commands is None:
+            if not os.path.exists(sql_script_path):
+                return None
+            with open(sql_script_path, 'r', encoding='utf-8') as f:
+                sql_commands = f.read()
+            self._sql_scripts[sql_script_path] = sql_commands
+        return sql_commands
+
+    def _create_trgm_indexes(self, conn, trgm_script_path):
+        """Создает необязательные триграммные индексы отдельной транзакцией.
+
+        Для CREATE EXTENSION pg_trgm нужны права, которых может не быть у роли приложения,
+        поэтому ошибка только записывается в лог: таблица и B-tree индексы уже созданы.
+
+        Args:
+            conn (psycopg2.connection): Соединение из пула.
+            trgm_script_path (str): Путь к скрипту init_trgm.sql.
+        """
+        sql_commands = self._read_sql_script(trgm_script_path)
+        if sql_commands is None:
+            logger.debug(f"Скрипт триграммных индексов не найден: {trgm_script_path}")
+            return
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql_commands)
+            conn.commit()
+            logger.info(f"Триграммные индексы созданы с использованием {trgm_script_path}")
+        except Error as e:
+            conn.rollback()
+            logger.warning(f"Не удалось создать триграммные индексы (нужны права на CREATE EXTENSION pg_trgm), "
+                           f"поиск по подстроке будет работать без них: {e}")
+
+    def create_table(self, sql_script_path=None, trgm_script_path=None):
         """Создает таблицу arbitration_cases на основе SQL-скрипта.
 
+        Скрипт выполняется не более одного раза за время жизни экземпляра:
+        текст скрипта кэшируется, а повторные вызовы после успешного создания
+        таблицы сразу возвращают True без обращения к файлу и БД. Затем отдельной
+        транзакцией выполняется скрипт триграммных индексов; его ошибка не влияет на результат.
+
         Args:
             sql_script_path (str, optional): Путь к SQL-скрипту для создания таблицы.
                                              Если не указан, используется путь по умолчанию.
+            trgm_script_path (str, optional): Путь к скрипту триграммных индексов. По умолчанию
+                                              init_trgm.sql в каталоге основного скрипта.
 
         Returns:
             bool: True, если таблица создана/обновлена успешно, иначе False.
         """
+        if self._table_ready:
+            return True
+
         if not sql_script_path:
             # Путь по умолчанию относительно db_manager.py для init_db.sql
             sql_script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'init_db.sql')
+        if not trgm_script_path:
+            trgm_script_path = os.path.join(os.path.dirname(os.path.abspath(sql_script_path)), 'init_trgm.sql')
 
-        if not os.path.exists(sql_script_path):
+        sql_commands = self._read_sql_script(sql_script_path)
+        if sql_commands is None:
             logger.error(f"Ошибка: SQL-скрипт не найден по пути: {sql_script_path}")
             return False
 
-        conn = None
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                with open(sql_script_path, 'r', encoding='utf-8') as f:
-                    sql_commands = f.read()
-                cursor.execute(sql_commands)
-                conn.commit()
-                logger.info(f"Таблица(ы) создана/обновлена с использованием {sql_script_path}")
-                return True
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor()
+                    cursor.execute(sql_commands)
+                    conn.commit()
+                    with self._known_cases_lock:
+                        self._known_cases.clear() # Скрипт пересоздает таблицу, кэш больше не актуален
+                    self._table_ready = True
+                    logger.info(f"Таблица(ы) создана/обновлена с использованием {sql_script_path}")
+                    self._create_trgm_indexes(conn, trgm_script_path)
+                    return True
         except OperationalError as e:
             logger.error(f"Операционная ошибка при выполнении SQL-скрипта: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время создания таблицы: {e}")
-        finally:
-            if conn:
-                conn.close()
         return False
 
     def insert_case(self, case_number, case_date, inn):
@@ -104,63 +332,103 @@ class DBManager:
 
         Args:
             case_number (str): Уникальный номер дела.
-            case_date (str): Дата дела (в формате 'YYYY-MM-DD').
+            case_date (datetime.date or str): Дата дела (datetime.date или строка 'YYYY-MM-DD').
             inn (str): ИНН, связанный с делом.
 
         Returns:
             bool: True, если дело вставлено или пропущено как дубликат, иначе False.
         """
-        conn = None
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                # Использование ON CONFLICT DO NOTHING для корректной обработки дубликатов case_number
-                insert_query = """
-                    INSERT INTO arbitration_cases (case_number, case_date, inn)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (case_number) DO NOTHING;
-                """
-                cursor.execute(insert_query, (case_number, case_date, inn))
-                conn.commit()
-                if cursor.rowcount == 0:
-                    logger.info(f"Дело {case_number} уже существует, вставка пропущена.")
-                else:
-                    logger.info(f"Дело {case_number} успешно вставлено.")
-                return True
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor()
+                    self._ensure_prepared(conn, cursor)
+                    # insert_case_stmt использует ON CONFLICT DO NOTHING для корректной обработки дубликатов case_number
+                    cursor.execute("EXECUTE insert_case_stmt (%s, %s, %s);", (case_number, case_date, inn))
+                    conn.commit()
+                    self._remember_cases((case_number,))
+                    # Построчное логирование только на уровне DEBUG, чтобы не форматировать строки и не писать в лог на каждую вставку
+                    if logger.isEnabledFor(logging.DEBUG):
+                        if cursor.rowcount == 0:
+                            logger.debug(f"Дело {case_number} уже существует, вставка пропущена.")
+                        else:
+                            logger.debug(f"Дело {case_number} успешно вставлено.")
+                    return True
         except OperationalError as e:
             logger.error(f"Операционная ошибка при вставке дела {case_number}: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время вставки дела: {e}")
-        finally:
-            if conn:
-                conn.close()
         return False
 
+    def insert_cases_bulk(self, cases, page_size=500):
+        """Вставляет список арбитражных дел одним пакетным запросом, пропуская дубликаты.
+
+        Все дела отправляются через `execute_values` и фиксируются одной транзакцией
+        вместо отдельного запроса и коммита на каждое дело.
+
+        Args:
+            cases (list): Список словарей с ключами 'case_number', 'case_date' (datetime.date) и 'inn'.
+            page_size (int, optional): Количество строк в одном INSERT. По умолчанию 500.
+
+        Returns:
+            int or None: Количество фактически вставленных дел (без дубликатов),
+                         или None, если вставка не удалась.
+        """
+        if not cases:
+            return 0
+
+        try:
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor()
+                    insert_query = """
+                        INSERT INTO arbitration_cases (case_number, case_date, inn)
+                        VALUES %s
+                        ON CONFLICT (case_number) DO NOTHING
+                        RETURNING case_number;
+                    """
+                    rows = [(case['case_number'], case['case_date'], case['inn']) for case in cases]
+                    inserted = execute_values(cursor, insert_query, rows, page_size=page_size, fetch=True)
+                    conn.commit()
+                    logger.info(f"Пакетная вставка: вставлено {len(inserted)}, пропущено как дубликаты {len(rows) - len(inserted)}.")
+                    return len(inserted)
+        except OperationalError as e:
+            logger.error(f"Операционная ошибка при пакетной вставке дел: {e}")
+        except Error as e:
+            logger.error(f"Ошибка базы данных во время пакетной вставки дел: {e}")
+        return None
+
     def case_exists(self, case_number):
         """Проверяет, существует ли арбитражное дело с заданным номером.
 
+        Положительные ответы кэшируются, поэтому повторная проверка уже известного
+        дела не обращается к базе данных.
+
         Args:
             case_number (str): Номер дела для проверки.
 
         Returns:
             bool: True, если дело существует, иначе False.
         """
-        conn = None
+        with self._known_cases_lock:
+            if case_number in self._known_cases:
+                self._known_cases.move_to_end(case_number)
+                return True
+
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                select_query = "SELECT 1 FROM arbitration_cases WHERE case_number = %s;"
-                cursor.execute(select_query, (case_number,))
-                return cursor.fetchone() is not None
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor()
+                    self._ensure_prepared(conn, cursor)
+                    cursor.execute("EXECUTE case_exists_stmt (%s);", (case_number,))
+                    exists = cursor.fetchone() is not None
+                    if exists:
+                        self._remember_cases((case_number,))
+                    return exists
         except OperationalError as e:
             logger.error(f"Операционная ошибка при проверке существования дела {case_number}: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время проверки существования дела: {e}")
-        finally:
-            if conn:
-                conn.close()
         return False
 
     def get_all_cases(self):
@@ -169,52 +437,71 @@ class DBManager:
         Returns:
             list: Список кортежей, каждый из которых представляет арбитражное дело.
         """
-        conn = None
         cases = []
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT case_number, case_date, inn FROM arbitration_cases;")
-                cases = cursor.fetchall()
-                logger.info(f"Извлечено {len(cases)} дел.")
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT case_number, case_date, inn FROM arbitration_cases;")
+                    cases = cursor.fetchall()
+                    logger.info(f"Извлечено {len(cases)} дел.")
         except OperationalError as e:
             logger.error(f"Операционная ошибка при извлечении всех дел: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время извлечения всех дел: {e}")
-        finally:
-            if conn:
-                conn.close()
         return cases
 
+    def iter_all_cases(self, batch_size=1000):
+        """Построчно выдает все арбитражные дела через серверный (именованный) курсор.
+
+        В отличие от `get_all_cases`, строки не загружаются в память целиком:
+        курсор подгружает их с сервера порциями по `batch_size`.
+
+        Args:
+            batch_size (int, optional): Количество строк, получаемых с сервера за один раз.
+                                        По умолчанию 1000.
+
+        Yields:
+            tuple: Кортеж (case_number, case_date, inn) для каждого дела.
+
+        Raises:
+            psycopg2.Error: При ошибке базы данных во время чтения.
+        """
+        try:
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor(name='cases_stream')
+                    cursor.itersize = batch_size
+                    try:
+                        cursor.execute("SELECT case_number, case_date, inn FROM arbitration_cases;")
+                        for row in cursor:
+                            yield row
+                    finally:
+                        cursor.close()
+        except Error as e:
+            logger.error(f"Ошибка базы данных во время потокового чтения дел: {e}")
+            raise
+
     def get_all_cases_as_dicts(self):
         """Извлекает все арбитражные дела из базы данных в виде списка словарей.
 
         Returns:
-            list: Список словарей, каждый из которых представляет арбитражное дело.
+            list: Список словарей, каждый из которых представляет арбитражное дело
+                  ('case_date' возвращается как datetime.date).
         """
-        conn = None
         cases_dicts = []
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT case_number, case_date, inn FROM arbitration_cases;")
-                columns = [col[0] for col in cursor.description] # Получить имена столбцов
-                for row in cursor.fetchall():
-                    # Преобразовать объект даты в строку для последующей JSON-сериализации
-                    row_list = list(row)
-                    if isinstance(row_list[1], (datetime.date, datetime.datetime)):
-                        row_list[1] = row_list[1].isoformat()
-                    cases_dicts.append(dict(zip(columns, row_list)))
-                logger.info(f"Извлечено {len(cases_dicts)} дел в виде словарей.")
+            with self._conn() as conn:
+                if conn:
+                    # RealDictCursor строит словари строк на стороне драйвера
+                    cursor = conn.cursor(cursor_factory=RealDictCursor)
+                    cursor.execute("SELECT case_number, case_date, inn FROM arbitration_cases;")
+                    cases_dicts = cursor.fetchall()
+                    logger.info(f"Извлечено {len(cases_dicts)} дел в виде словарей.")
         except OperationalError as e:
             logger.error(f"Операционная ошибка при извлечении всех дел в виде словарей: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время извлечения всех дел в виде словарей: {e}")
-        finally:
-            if conn:
-                conn.close()
         return cases_dicts
 
     def get_filtered_cases_as_dicts(self, case_number_filter=None, inn_filter=None, start_date=None, end_date=None):
@@ -223,49 +510,40 @@ class DBManager:
         Args:
             case_number_filter (str, optional): Часть или полный номер дела для фильтрации.
             inn_filter (str, optional): Часть или полный ИНН для фильтрации.
-            start_date (str, optional): Начальная дата (ГГГГ-ММ-ДД) для фильтрации по дате дела.
-            end_date (str, optional): Конечная дата (ГГГГ-ММ-ДД) для фильтрации по дате дела.
+            start_date (datetime.date, optional): Начальная дата для фильтрации по дате дела.
+            end_date (datetime.date, optional): Конечная дата для фильтрации по дате дела.
 
         Returns:
-            list: Список словарей, каждый из которых представляет арбитражное дело.
+            list: Список словарей, каждый из которых представляет арбитражное дело
+                  ('case_date' возвращается как datetime.date).
         """
-        conn = None
         cases_dicts = []
         try:
-            conn = self._get_connection()
-            if conn:
-                cursor = conn.cursor()
-                sql_query = "SELECT case_number, case_date, inn FROM arbitration_cases WHERE 1=1"
-                params = []
-
-                if case_number_filter:
-                    sql_query += " AND case_number ILIKE %s"
-                    params.append(f"%{case_number_filter}%")
-                if inn_filter:
-                    sql_query += " AND inn ILIKE %s"
-                    params.append(f"%{inn_filter}%")
-                if start_date:
-                    sql_query += " AND case_date >= %s"
-                    params.append(start_date)
-                if end_date:
-                    sql_query += " AND case_date <= %s"
-                    params.append(end_date)
-
-                cursor.execute(sql_query, tuple(params))
-                columns = [col[0] for col in cursor.description] # Получить имена столбцов
-                for row in cursor.fetchall():
-                    row_list = list(row)
-                    if isinstance(row_list[1], (datetime.date, datetime.datetime)):
-                        row_list[1] = row_list[1].isoformat()
-                    cases_dicts.append(dict(zip(columns, row_list)))
-                logger.info(f"Извлечено {len(cases_dicts)} отфильтрованных дел.")
+            with self._conn() as conn:
+                if conn:
+                    cursor = conn.cursor(cursor_factory=RealDictCursor)
+                    # Полный ИНН (10 или 12 цифр) ищется точным совпадением, часть ИНН - по подстроке
+                    exact_inn = bool(inn_filter) and inn_filter.isdigit() and len(inn_filter) in (10, 12)
+                    sql_query = _build_filter_query(
+                        bool(case_number_filter), bool(inn_filter), bool(start_date), bool(end_date), exact_inn
+                    )
+                    params = []
+                    if case_number_filter:
+                        params.append(f"%{case_number_filter}%")
+                    if inn_filter:
+                        params.append(inn_filter if exact_inn else f"%{inn_filter}%")
+                    if start_date:
+                        params.append(start_date)
+                    if end_date:
+                        params.append(end_date)
+
+                    cursor.execute(sql_query, tuple(params))
+                    cases_dicts = cursor.fetchall()
+                    logger.info(f"Извлечено {len(cases_dicts)} отфильтрованных дел.")
         except OperationalError as e:
             logger.error(f"Операционная ошибка при извлечении отфильтрованных дел: {e}")
         except Error as e:
             logger.error(f"Ошибка базы данных во время извлечения отфильтрованных дел: {e}")
-        finally:
-            if conn:
-                conn.close()
         return cases_dicts
 
 if __name__ == '__main__':
@@ -302,3 +580,5 @@ if __name__ == '__main__':
     all_cases = db_manager.get_all_cases()
     for case in all_cases:
         logger.info(case)
+
+    db_manager.close()
@@ -9,6 +9,13 @@ CREATE TABLE arbitration_cases (
     inn VARCHAR(12) NOT NULL                       -- ИНН (Идентификационный номер налогоплательщика), по которому было найдено дело
 );
 
+-- Индексы под условия фильтрации DBManager.get_filtered_cases_as_dicts:
+-- B-tree индекс - диапазон по дате дела,
+-- составной индекс - поиск по полному ИНН (inn = ...) вместе с диапазоном дат.
+-- Триграммные индексы для ILIKE '%...%' создаются отдельно скриптом init_trgm.sql
+CREATE INDEX IF NOT EXISTS idx_cases_case_date ON arbitration_cases (case_date);
+CREATE INDEX IF NOT EXISTS idx_cases_inn_case_date ON arbitration_cases (inn, case_date);
+
 -- Добавляем комментарии для лучшей документации
 COMMENT ON TABLE arbitration_cases IS 'Таблица для хранения информации об арбитражных делах.';
 COMMENT ON COLUMN arbitration_cases.case_number IS 'Уникальный номер арбитражного дела.';
@@ -0,0 +1,7 @@
+-- Необязательные триграммные GIN-индексы для ILIKE '%...%' по номеру дела и ИНН.
+-- Выполняются после init_db.sql отдельной транзакцией: CREATE EXTENSION требует прав
+-- суперпользователя или владельца базы данных (для доверенного расширения pg_trgm в PostgreSQL 13+).
+-- Без этих прав скрипт завершается ошибкой, а фильтрация работает без индексов.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_cases_case_number_trgm ON arbitration_cases USING gin (case_number gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_cases_inn_trgm ON arbitration_cases USING gin (inn gin_trgm_ops);
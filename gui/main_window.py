@@ -1,8 +1,161 @@
 
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QLabel, QHeaderView, QAbstractItemView, QFileDialog, QTextEdit
-from PyQt5.QtCore import Qt, QTimer # QTimer для неблокирующего UI во время тяжелых операций
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTableView, QLabel, QHeaderView, QAbstractItemView, QFileDialog, QTextEdit
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, QAbstractTableModel, QModelIndex, pyqtSignal
+from collections import deque
 import os
+from utils.logger import setup_logging
+
+logger = setup_logging()
+
+
+class WorkerSignals(QObject):
+    """Сигналы фоновой задачи `Worker` (QRunnable сам по себе не может испускать сигналы)."""
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Фоновая задача для QThreadPool, выполняющая произвольную функцию вне потока GUI."""
+    def __init__(self, fn, *args, **kwargs):
+        """Инициализирует задачу.
+
+        Args:
+            fn (callable): Функция для выполнения в фоновом потоке.
+            *args: Позиционные аргументы для `fn`.
+            **kwargs: Именованные аргументы для `fn`.
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Выполняет функцию и по завершении испускает сигнал `finished`."""
+        try:
+            self.fn(*self.args, **self.kwargs)
+        except Exception:
+            logger.exception("Необработанная ошибка в фоновой задаче.")
+        finally:
+            self.signals.finished.emit()
+
+class CasesModel(QAbstractTableModel):
+    """Модель таблицы результатов: хранит дела как кортежи готовых строк.
+
+    Представление запрашивает у модели только видимые ячейки, поэтому
+    объекты Qt на каждую ячейку не создаются. Текст ячеек формируется один раз
+    при добавлении дел, а не при каждой перерисовке.
+
+    Строки отдаются представлению страницами по PAGE_SIZE: следующая страница
+    загружается через canFetchMore/fetchMore, когда пользователь прокручивает
+    таблицу до конца.
+    """
+    COLUMNS = ('case_number', 'case_date', 'inn')
+    HEADERS = ('Номер дела', 'Дата дела', 'ИНН')
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        """Инициализирует пустую модель.
+
+        Args:
+            parent (QObject, optional): Родительский объект Qt.
+        """
+        super().__init__(parent)
+        self._cases = [] # Все дела модели
+        self._rows = []  # Тексты ячеек загруженных в представление дел (первые len(_rows) из _cases)
+
+    def rowCount(self, parent=QModelIndex()):
+        """Возвращает количество дел в модели."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Возвращает количество столбцов таблицы."""
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Возвращает текст ячейки для роли отображения.
+
+        Args:
+            index (QModelIndex): Индекс ячейки.
+            role (int, optional): Роль данных Qt. По умолчанию Qt.DisplayRole.
+
+        Returns:
+            str or None: Текст ячейки или None для остальных ролей.
+        """
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Возвращает заголовки столбцов и номера строк."""
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Сообщает представлению, остались ли незагруженные дела."""
+        return not parent.isValid() and len(self._rows) < len(self._cases)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Загружает в представление следующую страницу дел.
+
+        Args:
+            parent (QModelIndex, optional): Родительский индекс (для таблицы не используется).
+        """
+        if parent.isValid():
+            return
+        first_row = len(self._rows)
+        page = self._cases[first_row:first_row + self.PAGE_SIZE]
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(page) - 1)
+        self._rows.extend(self._display_row(case) for case in page)
+        self.endInsertRows()
+
+    @classmethod
+    def _display_row(cls, case_data):
+        """Формирует кортеж текстов ячеек для одного дела.
+
+        Args:
+            case_data (dict): Словарь, содержащий 'case_number', 'case_date' и 'inn'.
+
+        Returns:
+            tuple: Тексты ячеек в порядке столбцов COLUMNS.
+        """
+        values = (case_data.get(column) for column in cls.COLUMNS)
+        return tuple('' if value is None else str(value) for value in values)
+
+    def set_cases(self, cases):
+        """Заменяет содержимое модели списком дел.
+
+        Args:
+            cases (list): Список словарей, каждый из которых представляет арбитражное дело.
+        """
+        self.beginResetModel()
+        self._cases = list(cases)
+        self._rows = [self._display_row(case) for case in self._cases[:self.PAGE_SIZE]]
+        self.endResetModel()
+
+    def append_cases(self, cases):
+        """Добавляет пачку дел в конец модели одной операцией вставки строк.
+
+        Представление получает одно уведомление на всю пачку (в пределах
+        страницы PAGE_SIZE) вместо отдельной перекомпоновки на каждую строку.
+
+        Args:
+            cases (list): Список словарей, каждый из которых представляет арбитражное дело.
+        """
+        cases = list(cases)
+        if not cases:
+            return
+        fully_loaded = len(self._rows) == len(self._cases)
+        self._cases.extend(cases)
+        # Если в представление загружены еще не все дела, новые будут отданы через fetchMore
+        if fully_loaded:
+            self.fetchMore()
+
 
 class MainWindow(QMainWindow):
     """Главное окно приложения 'Arbitration Checker'.
@@ -10,9 +163,29 @@ class MainWindow(QMainWindow):
     Предоставляет пользовательский интерфейс для ввода ИНН, запуска скрапинга,
     фильтрации сохраненных дел и экспорта данных.
     """
+    # Сигналы для потокобезопасного обновления GUI из фоновых задач:
+    # испускаются из любого потока, а слоты выполняются в потоке GUI.
+    status_message = pyqtSignal(str)
+    results_ready = pyqtSignal(list)
+    cases_found = pyqtSignal(list)
+
+    # Начальная ширина столбцов таблицы результатов (последний столбец растягивается)
+    RESULTS_COLUMN_WIDTHS = (300, 150)
+
+    # Интервал, за который сообщения статуса накапливаются перед выводом одной операцией
+    STATUS_FLUSH_INTERVAL_MS = 50
+
     def __init__(self):
         """Инициализирует главное окно приложения."""
         super().__init__()
+        self.thread_pool = QThreadPool.globalInstance()
+        # Буфер сообщений статуса: QTextEdit перекомпоновывает документ на каждом append,
+        # поэтому сообщения выводятся пачкой не чаще раза в STATUS_FLUSH_INTERVAL_MS
+        self._pending_status = deque()
+        self._status_flush_timer = QTimer(self)
+        self._status_flush_timer.setSingleShot(True)
+        self._status_flush_timer.setInterval(self.STATUS_FLUSH_INTERVAL_MS)
+        self._status_flush_timer.timeout.connect(self._flush_status)
         self.setWindowTitle("Arbitration Checker")
         self.setGeometry(100, 100, 800, 600) # x, y, ширина, высота
 
@@ -90,11 +263,19 @@ class MainWindow(QMainWindow):
 
         # Область таблицы результатов
         results_label = QLabel("Результаты:")
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(3)
-        self.results_table.setHorizontalHeaderLabels(['Номер дела', 'Дата дела', 'ИНН'])
+        self.results_model = CasesModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Ширина столбцов задается заранее (пользователь может ее менять), последний столбец
+        # занимает оставшееся место; при добавлении строк ширины не пересчитываются
+        header = self.results_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate(self.RESULTS_COLUMN_WIDTHS):
+            self.results_table.setColumnWidth(column, width)
+        # Фиксированная высота строк: представлению не нужно измерять содержимое каждой строки
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         main_layout.addWidget(results_label)
         main_layout.addWidget(self.results_table)
@@ -107,6 +288,11 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(status_label)
         main_layout.addWidget(self.status_display)
 
+        # Доставка обновлений из фоновых задач в поток GUI
+        self.status_message.connect(self.append_status)
+        self.results_ready.connect(self.update_results_table)
+        self.cases_found.connect(self.add_cases_to_table)
+
         # Подключение кнопок к функциям 
         self.search_button.clicked.connect(self._on_search_clicked)
         self.filter_button.clicked.connect(self._on_filter_clicked)
@@ -122,11 +308,11 @@ class MainWindow(QMainWindow):
         """
         inn = self.scrape_inn_input.text()
         if inn:
-            self.status_display.append(f"Поиск дел для ИНН: {inn}...")
+            self.append_status(f"Поиск дел для ИНН: {inn}...")
             self.clear_results_table() # Очистить таблицу перед новым поиском
             # Этот вызов будет подключен к ApplicationLogic.start_scraping через main.py
         else:
-            self.status_display.append("Пожалуйста, введите ИНН для скрапинга.")
+            self.append_status("Пожалуйста, введите ИНН для скрапинга.")
 
     def _on_filter_clicked(self):
         """Обрабатывает нажатие кнопки 'Фильтровать' для поиска по сохраненным делам.
@@ -139,7 +325,7 @@ class MainWindow(QMainWindow):
         inn_filter = self.inn_filter_input.text()
         start_date = self.start_date_input.text()
         end_date = self.end_date_input.text()
-        self.status_display.append(f"Применение фильтров: Номер дела='{case_num_filter}', ИНН='{inn_filter}', Дата начала='{start_date}', Дата окончания='{end_date}'")
+        self.append_status(f"Применение фильтров: Номер дела='{case_num_filter}', ИНН='{inn_filter}', Дата начала='{start_date}', Дата окончания='{end_date}'")
         
 
     def _on_export_csv_clicked(self):
@@ -148,7 +334,7 @@ class MainWindow(QMainWindow):
         Вызывает логику экспорта CSV, которая будет подключена через main.py
         к ApplicationLogic.
         """
-        self.status_display.append("Нажата кнопка Экспорт в CSV. Логика будет интегрирована здесь.")
+        self.append_status("Нажата кнопка Экспорт в CSV. Логика будет интегрирована здесь.")
         # Заглушка для логики экспорта
 
     def _on_export_json_clicked(self):
@@ -157,25 +343,58 @@ class MainWindow(QMainWindow):
         Вызывает логику экспорта JSON, которая будет подключена через main.py
         к ApplicationLogic.
         """
-        self.status_display.append("Нажата кнопка Экспорт в JSON. Логика будет интегрирована здесь.")
+        self.append_status("Нажата кнопка Экспорт в JSON. Логика будет интегрирована здесь.")
         # Заглушка для логики экспорта
 
+    def run_in_background(self, fn, *args, on_finished=None, **kwargs):
+        """Выполняет функцию в пуле потоков, не блокируя цикл событий GUI.
+
+        Обновлять виджеты из `fn` следует через сигналы `status_message` и `results_ready`.
+
+        Args:
+            fn (callable): Функция для выполнения в фоновом потоке.
+            *args: Позиционные аргументы для `fn`.
+            on_finished (callable, optional): Слот, вызываемый в потоке GUI по завершении `fn`.
+            **kwargs: Именованные аргументы для `fn`.
+
+        Returns:
+            Worker: Запущенная фоновая задача.
+        """
+        worker = Worker(fn, *args, **kwargs)
+        if on_finished:
+            worker.signals.finished.connect(on_finished)
+        self.thread_pool.start(worker)
+        return worker
+
+    def append_status(self, message):
+        """Добавляет сообщение в буфер статуса; вывод в status_display выполняется по таймеру.
+
+        Args:
+            message (str): Текст сообщения.
+        """
+        self._pending_status.append(message)
+        if not self._status_flush_timer.isActive():
+            self._status_flush_timer.start()
+
+    def _flush_status(self):
+        """Выводит накопленные сообщения статуса одним добавлением в status_display."""
+        if not self._pending_status:
+            return
+        messages = '\n'.join(self._pending_status)
+        self._pending_status.clear()
+        self.status_display.append(messages)
+
     def clear_results_table(self):
         """Очищает все содержимое таблицы результатов."""
-        self.results_table.setRowCount(0)
-        self.results_table.clearContents() # Также очищает заголовки
+        self.results_model.set_cases([])
 
-    def add_case_to_table(self, case_data):
-        """Добавляет одно арбитражное дело в таблицу результатов.
+    def add_cases_to_table(self, cases):
+        """Добавляет несколько арбитражных дел в таблицу результатов за одну вставку.
 
         Args:
-            case_data (dict): Словарь, содержащий 'case_number', 'case_date' и 'inn'.
+            cases (list): Список словарей, каждый из которых представляет арбитражное дело.
         """
-        row_position = self.results_table.rowCount()
-        self.results_table.insertRow(row_position)
-        self.results_table.setItem(row_position, 0, QTableWidgetItem(case_data['case_number']))
-        self.results_table.setItem(row_position, 1, QTableWidgetItem(str(case_data['case_date']))) # Преобразовать дату в строку
-        self.results_table.setItem(row_position, 2, QTableWidgetItem(case_data['inn']))
+        self.results_model.append_cases(cases)
 
     def update_results_table(self, cases):
         """Обновляет таблицу результатов списком дел.
@@ -183,9 +402,7 @@ class MainWindow(QMainWindow):
         Args:
             cases (list): Список словарей, каждый из которых представляет арбитражное дело.
         """
-        self.clear_results_table()
-        for case in cases:
-            self.add_case_to_table(case)
+        self.results_model.set_cases(cases)
 
 
 if __name__ == '__main__':
@@ -3,21 +3,10 @@ import os
 import sys
 import configparser
 
-# Корректировка пути Python для возможности импорта модулей из структуры проекта.
-# project_root_path - это абсолютный путь к каталогу arbitration_checker.
+# Каталог проекта; импорты пакетов core, gui и т.д. работают без правки sys.path,
+# так как Python добавляет каталог запускаемого скрипта в путь поиска модулей.
 project_root_path = os.path.dirname(os.path.abspath(__file__))
 
-# Убеждаемся, что родительский каталог project_root_path находится в sys.path.
-# Это позволяет корректно импортировать модули, такие как 'gui.main_window',
-# когда main.py запускается из директории, находящейся выше его собственной.
-parent_of_project_root = os.path.abspath(os.path.join(project_root_path, '..'))
-if parent_of_project_root not in sys.path:
-    sys.path.insert(0, parent_of_project_root)
-
-# Также убеждаемся, что сам project_root_path находится в sys.path.
-if project_root_path not in sys.path:
-    sys.path.insert(0, project_root_path)
-
 from gui.main_window import MainWindow
 from scraper.arbitr_scraper import ArbitrScraper
 from database.db_manager import DBManager
@@ -39,37 +28,45 @@ def main_app():
     config = configparser.ConfigParser()
     config.read(settings_path)
 
-    # 1. Инициализация DBManager и обеспечение существования таблицы
+    # 1. Инициализация QApplication и MainWindow: окно отображается сразу,
+    # не дожидаясь подключения к базе данных
+    app = QApplication(sys.argv)
+    main_window = MainWindow()
+    main_window.show()
+    print("MainWindow инициализировано.")
+
+    # 2. Инициализация DBManager (соединение с БД устанавливается лениво, при первом запросе)
     db_manager = DBManager(config_path=settings_path)
-    print("Инициализация таблицы базы данных...")
-    # Путь к init_db.sql относительно корня проекта
-    sql_script_path = os.path.join(project_root_path, 'database', 'init_db.sql')
-    db_manager.create_table(sql_script_path=sql_script_path)
-    print("Инициализация таблицы базы данных завершена.")
 
-    # 2. Инициализация ArbitrScraper
+    # 3. Инициализация ArbitrScraper (WebDriver создается лениво, при первом поиске через Selenium)
     scraper = ArbitrScraper(config_path=settings_path)
     print("ArbitrScraper инициализирован.")
 
-    # 3. Инициализация QApplication и MainWindow
-    app = QApplication(sys.argv)
-    main_window = MainWindow()
-    print("MainWindow инициализировано.")
-
     # 4. Инициализация ApplicationLogic
-    # Передаем методы из main_window для обновления его статусного дисплея и таблицы результатов
+    # Передаем сигналы main_window для обновления его статусного дисплея и таблицы результатов:
+    # логика выполняется в фоновых потоках, а сигналы доставляют обновления в поток GUI
     application_logic = ApplicationLogic(
         scraper=scraper,
         db_manager=db_manager,
-        gui_status_updater=main_window.status_display.append,
-        gui_results_updater=main_window.update_results_table
+        gui_status_updater=main_window.status_message.emit,
+        gui_results_updater=main_window.results_ready.emit,
+        gui_cases_appender=main_window.cases_found.emit
     )
     print("ApplicationLogic инициализировано.")
 
     # 5. Подключение элементов GUI к логике приложения
-    main_window.search_button.clicked.connect(
-        lambda: application_logic.start_scraping(main_window.scrape_inn_input.text())
-    )
+    # Скрапинг выполняется в фоновом потоке; кнопка блокируется до его завершения,
+    # так как скрапер использует один экземпляр WebDriver
+    def search_action():
+        """Действие по запуску скрапинга для введенного ИНН."""
+        main_window.search_button.setEnabled(False)
+        main_window.run_in_background(
+            application_logic.start_scraping,
+            main_window.scrape_inn_input.text(),
+            on_finished=lambda: main_window.search_button.setEnabled(True)
+        )
+
+    main_window.search_button.clicked.connect(search_action)
     print("Кнопка поиска GUI подключена к логике скрапинга.")
 
     # Подключение кнопки фильтрации к логике приложения
@@ -88,20 +85,57 @@ def main_app():
         """Действие по экспорту данных в CSV-файл."""
         file_path, _ = QFileDialog.getSaveFileName(main_window, "Экспорт CSV", "cases.csv", "CSV Files (*.csv)")
         if file_path:
-            application_logic.export_data_to_csv(file_path)
+            main_window.run_in_background(application_logic.export_data_to_csv, file_path)
 
     def export_json_action():
         """Действие по экспорту данных в JSON-файл."""
         file_path, _ = QFileDialog.getSaveFileName(main_window, "Экспорт JSON", "cases.json", "JSON Files (*.json)")
         if file_path:
-            application_logic.export_data_to_json(file_path)
+            main_window.run_in_background(application_logic.export_data_to_json, file_path)
 
     main_window.export_csv_button.clicked.connect(export_csv_action)
     main_window.export_json_button.clicked.connect(export_json_action)
     print("Кнопки экспорта GUI подключены к логике экспорта.")
 
-    # Отображаем главное окно и запускаем цикл обработки событий приложения
-    main_window.show()
+    # 6. Инициализация таблицы базы данных в фоновом потоке; кнопки, работающие с БД,
+    # недоступны до ее завершения
+    backend_buttons = (
+        main_window.search_button,
+        main_window.filter_button,
+        main_window.export_csv_button,
+        main_window.export_json_button
+    )
+    for button in backend_buttons:
+        button.setEnabled(False)
+
+    def init_database():
+        """Пересоздает таблицу базы данных скриптом init_db.sql.
+
+        Скрипт начинается с DROP TABLE IF EXISTS, поэтому сохраненные ранее дела
+        удаляются при каждом запуске приложения.
+        """
+        print("Инициализация таблицы базы данных...")
+        main_window.status_message.emit("Подключение к базе данных...")
+        # Путь к init_db.sql относительно корня проекта
+        sql_script_path = os.path.join(project_root_path, 'database', 'init_db.sql')
+        if db_manager.create_table(sql_script_path=sql_script_path):
+            main_window.status_message.emit("База данных готова к работе.")
+        else:
+            main_window.status_message.emit("Ошибка инициализации базы данных. Проверьте настройки и запущен ли PostgreSQL.")
+        print("Инициализация таблицы базы данных завершена.")
+
+    def enable_backend_buttons():
+        """Делает доступными кнопки, работающие с базой данных."""
+        for button in backend_buttons:
+            button.setEnabled(True)
+
+    main_window.run_in_background(init_database, on_finished=enable_backend_buttons)
+
+    # Закрываем пул соединений с БД и WebDriver при завершении приложения
+    app.aboutToQuit.connect(db_manager.close)
+    app.aboutToQuit.connect(scraper.close)
+
+    # Запускаем цикл обработки событий приложения
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -1,9 +1,11 @@
 
 import os
 import configparser
+import functools
 import logging
 import datetime
-import time
+import re
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,33 +13,141 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
 from utils.logger import setup_logging 
 
 # Настройка логирования для ArbitrScraper
 logger = setup_logging()
 
+# Дата в формате ASP.NET JSON: "/Date(1672531200000)/" или "/Date(1672531200000+0300)/"
+_ASPNET_DATE_RE = re.compile(r'/Date\((-?\d+)([+-]\d{4})?')
+
+# Часовой пояс kad.arbitr.ru (Москва, UTC+3 без перехода на летнее время) для дат без смещения
+_MOSCOW_TZ = datetime.timezone(datetime.timedelta(hours=3))
+
+# Ссылки с номерами дел в таблице результатов поиска
+_RESULT_LINKS_SELECTOR = "table#b-cases a.num_case"
+
+# Сообщение "ничего не найдено", которое сайт показывает вместо таблицы результатов
+_NO_RESULTS_SELECTOR = ".b-noResults"
+
+# Установка значения поля ввода с генерацией событий, которые генерирует ввод с клавиатуры
+_SET_INPUT_VALUE_JS = """
+var field = arguments[0];
+field.focus();
+field.value = arguments[1];
+field.dispatchEvent(new Event("input", {bubbles: true}));
+field.dispatchEvent(new Event("change", {bubbles: true}));
+"""
+
+# Чтение строк таблицы результатов за один вызов: для первых arguments[0] строк
+# с номером дела возвращается пара [номер дела, дата из первой ячейки]
+_READ_RESULT_ROWS_JS = """
+var limit = arguments[0];
+var rows = [];
+var trs = document.querySelectorAll("table#b-cases tr");
+for (var i = 0; i < trs.length && rows.length < limit; i++) {
+    var link = trs[i].querySelector("a.num_case");
+    if (!link) { continue; }
+    var cell = trs[i].querySelector("td");
+    var date = cell ? cell.innerText.match(/\\d{1,2}\\.\\d{1,2}\\.\\d{4}/) : null;
+    rows.push([link.innerText.trim(), date ? date[0] : ""]);
+}
+return rows;
+"""
+
+def _parse_ru_date(value):
+    """Разбирает дату в формате 'дд.мм.гггг', как она выводится в таблице результатов.
+
+    Формат фиксирован, поэтому строка разбирается срезом без strptime;
+    strptime используется только как запасной путь для нестандартных строк
+    (например, без ведущих нулей).
+
+    Args:
+        value (str): Строка даты.
+
+    Returns:
+        datetime.date: Дата дела.
+
+    Raises:
+        ValueError: Если строку не удалось разобрать как дату.
+    """
+    parts = value.split('.')
+    if len(parts) == 3:
+        day, month, year = parts
+        if len(day) == 2 and len(month) == 2 and len(year) == 4 and (day + month + year).isdigit():
+            return datetime.date(int(year), int(month), int(day))
+    return datetime.datetime.strptime(value, '%d.%m.%Y').date()
+
+@functools.lru_cache(maxsize=1)
+def _read_config(config_path, mtime):
+    """Читает файл настроек; результат кэшируется по пути и времени изменения файла.
+
+    В кэше хранится только последняя прочитанная версия файла, причем в виде
+    неизменяемых кортежей, чтобы вызывающие стороны не могли изменить общие данные.
+
+    Args:
+        config_path (str): Путь к файлу settings.ini.
+        mtime (float or None): Время изменения файла (часть ключа кэша).
+
+    Returns:
+        tuple: Пары (имя секции, кортеж пар (ключ, значение)) без подстановки интерполяций.
+    """
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    sections = [(configparser.DEFAULTSECT, tuple(config.defaults().items()))]
+    for section in config.sections():
+        sections.append((section, tuple(config.items(section, raw=True))))
+    return tuple(sections)
+
+def _load_config(config_path):
+    """Возвращает конфигурацию, перечитывая файл только после его изменения.
+
+    Args:
+        config_path (str): Путь к файлу settings.ini.
+
+    Returns:
+        configparser.ConfigParser: Новый экземпляр конфигурации, собранный из кэша.
+    """
+    try:
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = None
+    config = configparser.ConfigParser()
+    config.read_dict({section: dict(options) for section, options in _read_config(config_path, mtime)})
+    return config
+
 class ArbitrScraper:
-    """Класс для веб-скрапинга арбитражных дел с kad.arbitr.ru с использованием Selenium.
+    """Класс для получения арбитражных дел с kad.arbitr.ru.
 
-    Инкапсулирует логику инициализации WebDriver, ввода ИНН в поле поиска,
+    Основной путь - прямой запрос к JSON API сайта. Запасной путь через Selenium
+    инкапсулирует логику инициализации WebDriver, ввода ИНН в поле поиска,
     активации кнопки 'Найти', ожидания загрузки результатов и извлечения
     номера дела и даты из найденных результатов.
     """
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, config=None):
         """Инициализирует скрапер арбитражных дел.
 
         Args:
             config_path (str, optional): Путь к файлу конфигурации settings.ini.
                                          Если не указан, используется путь по умолчанию.
+            config (dict or configparser.ConfigParser, optional): Готовая конфигурация.
+                                         Если передана, файл настроек не читается.
         """
-        self.config = configparser.ConfigParser()
-        if config_path:
-            self.config.read(config_path)
+        if isinstance(config, configparser.ConfigParser):
+            self.config = config
+            logger.info("ArbitrScraper: Используется переданная конфигурация.")
+        elif config is not None:
+            self.config = configparser.ConfigParser()
+            self.config.read_dict(config)
+            logger.info("ArbitrScraper: Используется переданная конфигурация.")
+        elif config_path:
+            self.config = _load_config(config_path)
             logger.info(f"ArbitrScraper: Используется предоставленный config_path: {config_path}")
         else:
             # Путь по умолчанию относительно корня проекта для settings.ini
             default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.ini')
-            self.config.read(default_config_path)
+            self.config = _load_config(default_config_path)
             logger.info(f"ArbitrScraper: Используется config_path по умолчанию: {default_config_path}")
 
         logger.info(f"Загруженные секции конфигурации: {self.config.sections()}")
@@ -48,9 +158,41 @@ class ArbitrScraper:
 
         self.webdriver_path = self.config.get('SELENIUM', 'webdriver_path', fallback='')
         self.base_url = "https://kad.arbitr.ru/"
+        self.search_api_url = "https://kad.arbitr.ru/Kad/SearchInstances"
+        self.api_timeout = 15
         self.driver = None
+        self._service = None # Service chromedriver с найденным путем к исполняемому файлу
+        # HTTP-сессия для прямых запросов к JSON API (соединение переиспользуется между поисками)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Accept': 'application/json, text/javascript, */*',
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-Requested-With': 'XMLHttpRequest',
+            'Origin': 'https://kad.arbitr.ru',
+            'Referer': self.base_url,
+        })
         
         
+    def _get_service(self):
+        """Возвращает Service chromedriver, создавая его при первом вызове.
+
+        Путь к chromedriver берется из 'webdriver_path' в settings.ini, а если файл
+        не найден - скачивается через ChromeDriverManager. Service сохраняется, поэтому
+        повторная инициализация WebDriver (например, после потери сессии браузера)
+        не ищет и не скачивает chromedriver заново.
+
+        Returns:
+            Service: Service chromedriver.
+        """
+        if self._service is None:
+            if self.webdriver_path and os.path.isfile(self.webdriver_path):
+                executable_path = self.webdriver_path
+            else:
+                executable_path = ChromeDriverManager().install()
+            self._service = Service(executable_path=executable_path)
+            logger.info(f"Используется chromedriver: {executable_path}")
+        return self._service
+
     def _initialize_webdriver(self):
         """Инициализирует и возвращает экземпляр WebDriver для Chrome.
 
@@ -70,11 +212,18 @@ class ArbitrScraper:
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Разбирается только таблица результатов, поэтому картинки и уведомления не загружаются
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
         chrome_options.accept_insecure_certs = False
-        chrome_options.page_load_strategy = "normal"
+        # driver.get возвращается после DOMContentLoaded, не дожидаясь загрузки всех ресурсов;
+        # нужные элементы страницы ожидаются явно через WebDriverWait
+        chrome_options.page_load_strategy = "eager"
 
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = webdriver.Chrome(service=self._get_service(), options=chrome_options)
             logger.info("WebDriver успешно инициализирован.")
             return self.driver
         except WebDriverException as e:
@@ -83,17 +232,136 @@ class ArbitrScraper:
                 logger.error("Убедитесь, что chromedriver находится в вашем PATH или укажите 'webdriver_path' в settings.ini.")
             self.driver = None
             return None
+        except Exception as e:
+            # Ошибки ChromeDriverManager: нет сети, не удалось определить версию Chrome и т.п.
+            logger.error(f"Не удалось получить chromedriver: {e}")
+            self.driver = None
+            return None
 
-    def scrape_arbitr_cases(self, inn, max_results=10):
+    def scrape_arbitr_cases(self, inn, max_results=10, on_case=None):
         """Скрапинг арбитражных дел для заданного ИНН с kad.arbitr.ru.
 
+        Сначала выполняется прямой запрос к JSON API сайта. Если API недоступно
+        (HTTP 403/429, CAPTCHA, ответ не в формате JSON), используется браузер Selenium.
+
+        Args:
+            inn (str): Идентификационный номер налогоплательщика для поиска.
+            max_results (int): Максимальное количество дел для извлечения.
+            on_case (callable, optional): Вызывается с каждым извлеченным делом сразу после
+                                          разбора строки (например, для вывода в GUI по ходу скрапинга).
+
+        Returns:
+            list: Список словарей, каждый из которых содержит 'case_number', 'case_date' (datetime.date) и 'inn'.
+        """
+        cases_data = self._scrape_via_api(inn, max_results, on_case)
+        if cases_data is not None:
+            return cases_data
+        logger.info("JSON API недоступно, выполняю поиск через Selenium.")
+        return self._scrape_via_selenium(inn, max_results, on_case)
+
+    @staticmethod
+    def _parse_api_date(value):
+        """Разбирает дату из ответа JSON API.
+
+        Args:
+            value (str or None): Дата в формате ASP.NET ("/Date(ms)/", "/Date(ms+0300)/") или ISO 8601.
+                Метка времени без смещения переводится в московское время.
+
+        Returns:
+            datetime.date or None: Дата дела или None, если разобрать не удалось.
+        """
+        if not value:
+            return None
+        match = _ASPNET_DATE_RE.match(value)
+        if match:
+            timestamp = int(match.group(1)) / 1000
+            offset = match.group(2)
+            if offset:
+                # Смещение "+0300" задает часовой пояс, в котором дата дела была записана
+                sign = -1 if offset[0] == '-' else 1
+                tz = datetime.timezone(sign * datetime.timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+            else:
+                tz = _MOSCOW_TZ
+            return datetime.datetime.fromtimestamp(timestamp, tz).date()
+        try:
+            return datetime.date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+
+    def _scrape_via_api(self, inn, max_results, on_case=None):
+        """Ищет дела прямым POST-запросом к JSON API kad.arbitr.ru без запуска браузера.
+
         Args:
             inn (str): Идентификационный номер налогоплательщика для поиска.
             max_results (int): Максимальное количество дел для извлечения.
+            on_case (callable, optional): Вызывается с каждым извлеченным делом.
+
+        Returns:
+            list or None: Список дел, или None, если API недоступно и нужен запасной путь через Selenium.
+        """
+        payload = {
+            "Page": 1,
+            "Count": max_results,
+            "Courts": [],
+            "DateFrom": None,
+            "DateTo": None,
+            "Sides": [{"Name": inn, "Type": -1, "ExactMatch": False}],
+            "Judges": [],
+            "CaseNumbers": [],
+            "WithVKSInstances": False
+        }
+        try:
+            response = self.session.post(self.search_api_url, json=payload, timeout=self.api_timeout)
+        except requests.RequestException as e:
+            logger.warning(f"Ошибка запроса к JSON API: {e}")
+            return None
+
+        if response.status_code in (403, 429):
+            logger.warning(f"JSON API отклонило запрос (HTTP {response.status_code}), вероятно, требуется CAPTCHA.")
+            return None
+        if not response.ok or 'json' not in response.headers.get('Content-Type', ''):
+            logger.warning(f"Неожиданный ответ JSON API: HTTP {response.status_code}, {response.headers.get('Content-Type')}.")
+            return None
+
+        try:
+            items = response.json()['Result']['Items']
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Не удалось разобрать ответ JSON API: {e}")
+            return None
+        # "Items": null или элементы не-объекты означают, что формат ответа изменился
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            logger.warning("Неожиданная структура ответа JSON API: список дел отсутствует или поврежден.")
+            return None
+
+        cases_data = []
+        for item in items[:max_results]:
+            case_number = (item.get('CaseNumber') or '').strip()
+            case_date = self._parse_api_date(item.get('Date') or item.get('RegistrationDate'))
+            if case_number and case_date:
+                case = {
+                    'case_number': case_number,
+                    'case_date': case_date,
+                    'inn': inn
+                }
+                cases_data.append(case)
+                if on_case:
+                    on_case(case)
+        logger.info(f"JSON API: извлечено {len(cases_data)} дел для ИНН {inn}.")
+        return cases_data
+
+    def _scrape_via_selenium(self, inn, max_results, on_case=None):
+        """Ищет дела через браузер: вводит ИНН, нажимает 'Найти' и разбирает таблицу результатов.
+
+        Args:
+            inn (str): Идентификационный номер налогоплательщика для поиска.
+            max_results (int): Максимальное количество дел для извлечения.
+            on_case (callable, optional): Вызывается с каждым извлеченным делом.
 
         Returns:
             list: Список словарей, каждый из которых содержит 'case_number', 'case_date' и 'inn'.
         """
+        # Драйвер создается при первом вызове и переиспользуется последующими;
+        # переход на base_url ниже сбрасывает состояние страницы перед новым поиском.
         if not self.driver:
             self._initialize_webdriver()
             if not self.driver:
@@ -111,8 +379,9 @@ class ArbitrScraper:
             inn_input = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.XPATH, "/html/body/div[1]/div[1]/div[1]/dl/dd/div[1]/div/textarea"))
             )
-            inn_input.clear()
-            inn_input.send_keys(inn)
+            # Значение поля заменяется одним вызовом execute_script вместо clear() и
+            # посимвольного send_keys; события input/change уведомляют обработчики страницы
+            self.driver.execute_script(_SET_INPUT_VALUE_JS, inn_input, inn)
             logger.info(f"Введен ИНН: {inn}")
 
 
@@ -122,68 +391,48 @@ class ArbitrScraper:
             )
             self.driver.execute_script("arguments[0].click();", search_button)
             logger.info("Нажата кнопка 'Найти' ")
-          
-            time.sleep(5)
 
-            # Ожидание загрузки результатов поиска (например, наличие конкретного блока результатов)
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, "b-cases")) 
-            )
-            logger.info("Результаты поиска загружены.")
-            
-
-            # Извлечение данных дел
-            # Предполагается, что результаты находятся в строках, и каждая строка содержит номер дела и дату.
-            # Этот XPath должен быть адаптирован к фактической HTML-структуре результатов kad.arbitr.ru.
-            result_rows = self.driver.find_elements(By.XPATH, 
-            "//table[@id='b-cases']//tr[.//a[@class='num_case']]"
-            )
-                                                    
-            for i, row in enumerate(result_rows):
-                if len(cases_data) >= max_results:
-                    break
-    
-                    
+            # Ожидание загрузки результатов поиска: вместо фиксированной паузы ждем
+            # появления ссылок с номерами дел в таблице b-cases или сообщения об отсутствии
+            # результатов, чтобы пустой поиск не ждал весь таймаут (CSS-селекторы проверяются
+            # браузером быстрее XPath, который на каждой проверке обходит дерево документа).
+            # Эти селекторы должны быть адаптированы к фактической HTML-структуре результатов kad.arbitr.ru.
+            try:
+                WebDriverWait(self.driver, 20).until(EC.any_of(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, _RESULT_LINKS_SELECTOR)),
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, _NO_RESULTS_SELECTOR))
+                ))
+                logger.info("Результаты поиска загружены.")
+                # Номера и даты строк читаются одним вызовом execute_script вместо
+                # нескольких запросов к WebDriver на каждую строку; лишние строки
+                # сверх max_results отбрасываются еще в браузере
+                result_rows = self.driver.execute_script(_READ_RESULT_ROWS_JS, max_results) or []
+                if not result_rows:
+                    logger.info(f"Сайт сообщил, что дела для ИНН {inn} не найдены.")
+            except TimeoutException:
+                result_rows = []
+                logger.info(f"Результаты поиска для ИНН {inn} не появились за отведенное время; дела не найдены.")
+
+            for i, (case_number, case_date_str) in enumerate(result_rows):
+                # Попытка разобрать строку даты; дата хранится как datetime.date вплоть до вывода
                 try:
-                    # Извлечение номера дела
-                    # Эта часть сильно зависит от фактической HTML-структуры.
-                    # Пример: ссылка с текстом номера дела или конкретный span.
-                    # Извлечение даты дела
-                    # Пример: span с датой или div, содержащий дату.
-
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                
-                    if len(cells) >= 4:
-                        # Ячейка 1: дата и номер дела
-                        first_cell = cells[0]
-                        
-                        # Извлечение даты 
-                        date_element = first_cell.find_element(By.XPATH, ".//*[contains(text(), '.')][1]")
-                        case_date_str = date_element.text.strip() if date_element else ""
-                    
-                        # Извлечение номера дела (ссылка с номером)
-                        case_link = first_cell.find_element(By.XPATH, ".//a[contains(@href, '/Card/')]")
-                        case_number = case_link.text.strip()
-                        
-                    # Попытка разобрать строку даты в стандартный формат 
-                    try:
-                        case_date = datetime.datetime.strptime(case_date_str, '%d.%m.%Y').strftime('%Y-%m-%d')
-                    except ValueError:
-                        case_date = None #  Или обработать как строку, если разбор не удался
-                        logger.warning(f"Не удалось разобрать дату: {case_date_str} для дела {case_number}")
-
-                    if case_number and case_date:
-                        cases_data.append({
-                            'case_number': case_number,
-                            'case_date': case_date,
-                            'inn': inn
-                        })
-                        logger.info(f"Извлечено: Дело {case_number}, Дата {case_date}, ИНН {inn}")
-
-                except NoSuchElementException:
-                    logger.warning(f"Не удалось найти элементы номера дела или даты в строке результатов {i+1}. Пропуск.")
-                except Exception as ex:
-                    logger.warning(f"Ошибка обработки строки результатов {i+1}: {ex}. Пропуск.")
+                    case_date = _parse_ru_date(case_date_str)
+                except ValueError:
+                    logger.warning(f"Не удалось разобрать дату: {case_date_str} для дела {case_number} (строка {i+1}). Пропуск.")
+                    continue
+
+                if case_number:
+                    case = {
+                        'case_number': case_number,
+                        'case_date': case_date,
+                        'inn': inn
+                    }
+                    cases_data.append(case)
+                    if on_case:
+                        on_case(case)
+                    logger.info(f"Извлечено: Дело {case_number}, Дата {case_date}, ИНН {inn}")
+                else:
+                    logger.warning(f"Не удалось найти номер дела в строке результатов {i+1}. Пропуск.")
 
         except TimeoutException:
             logger.error("Таймаут ожидания появления элементов.")
@@ -191,15 +440,39 @@ class ArbitrScraper:
             logger.error(f"Элемент не найден: {e}")
         except WebDriverException as e:
             logger.error(f"Ошибка WebDriver во время скрапинга: {e}")
+            # Сессия браузера могла быть потеряна: закрываем драйвер, следующий вызов создаст новый
+            self.close()
         except Exception as e:
             logger.error(f"Произошла неожиданная ошибка во время скрапинга: {e}")
-        finally:
-            if self.driver:
-                self.driver.quit()
-                logger.info("WebDriver закрыт.")
 
         return cases_data
 
+    def __enter__(self):
+        """Позволяет использовать скрапер в блоке `with`; WebDriver создается лениво при первом поиске через Selenium."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Закрывает WebDriver при выходе из блока `with`."""
+        self.close()
+        return False
+
+    def close(self):
+        """Закрывает WebDriver, если он был инициализирован.
+
+        Драйвер переиспользуется между вызовами `scrape_arbitr_cases`, поэтому
+        его необходимо закрыть явно по завершении работы со скрапером.
+        quit() также останавливает процесс chromedriver; объект Service сохраняется
+        и запускается заново при следующей инициализации WebDriver.
+        """
+        if self.driver:
+            try:
+                self.driver.quit()
+                logger.info("WebDriver закрыт.")
+            except WebDriverException as e:
+                logger.warning(f"Ошибка при закрытии WebDriver: {e}")
+            finally:
+                self.driver = None
+
 if __name__ == '__main__':
     # Этот блок предназначен для непосредственного тестирования функциональности ArbitrScraper.
     # Он будет выполнен только в случае, если arbitr_scraper.py запущен как скрипт.
@@ -212,21 +485,20 @@ if __name__ == '__main__':
     project_root = os.path.abspath(os.path.join(script_dir, '.'))
     test_config_path = os.path.join(project_root, 'settings.ini')
 
-    scraper = ArbitrScraper(config_path=test_config_path)
+    with ArbitrScraper(config_path=test_config_path) as scraper:
+        test_inn = "0000000000" # Пример ИНН 
+        # Примечание: Скрапинг kad.arbitr.ru может быть ограничен по частоте запросов
+        # или требовать CAPTCHA. Это базовая реализация и может потребовать дальнейших
+        # доработок для повышения надежности.
 
-    test_inn = "0000000000" # Пример ИНН 
-    # Примечание: Скрапинг kad.arbitr.ru может быть ограничен по частоте запросов
-    # или требовать CAPTCHA. Это базовая реализация и может потребовать дальнейших
-    # доработок для повышения надежности.
+        logger.info(f"Скрапинг дел для ИНН: {test_inn}")
+        cases = scraper.scrape_arbitr_cases(test_inn)
 
-    logger.info(f"Скрапинг дел для ИНН: {test_inn}")
-    cases = scraper.scrape_arbitr_cases(test_inn)
-
-    if cases:
-        logger.info(f"Найдено {len(cases)} дел для ИНН {test_inn}:")
-        for case in cases:
-            logger.info(case)
-    else:
-        logger.info(f"Дела не найдены или произошла ошибка для ИНН {test_inn}.")
+        if cases:
+            logger.info(f"Найдено {len(cases)} дел для ИНН {test_inn}:")
+            for case in cases:
+                logger.info(case)
+        else:
+            logger.info(f"Дела не найдены или произошла ошибка для ИНН {test_inn}.")
 
     logger.info("--- Тестирование ArbitrScraper завершено ---") # Экранированные символы новой строки
@@ -0,0 +1,67 @@
+import os
+import sys
+import pytest
+from unittest.mock import patch, MagicMock
+
+# Корень проекта добавляется в sys.path один раз для всех модулей тестов,
+# чтобы импортировать пакеты core, database, gui, scraper и utils.
+project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root_path not in sys.path:
+    sys.path.insert(0, project_root_path)
+
+
+@pytest.fixture
+def mock_chrome_only():
+    """Фикстура для мокирования только `selenium.webdriver.Chrome`.
+
+    Подходит для тестов, которым нужен лишь фиктивный драйвер, без поиска
+    chromedriver через ChromeDriverManager.
+
+    Returns:
+        tuple: Мок `webdriver.Chrome` и фиктивный объект драйвера.
+    """
+    with patch('selenium.webdriver.Chrome') as mock_chrome:
+        mock_driver = MagicMock()
+        mock_chrome.return_value = mock_driver
+        yield mock_chrome, mock_driver
+
+
+@pytest.fixture
+def mock_webdriver_components(mock_chrome_only):
+    """Фикстура для мокирования компонентов WebDriver Selenium.
+
+    Дополнительно к `mock_chrome_only` мокирует `ChromeDriverManager.install`;
+    нужна только тестам инициализации WebDriver.
+    """
+    mock_chrome, mock_driver = mock_chrome_only
+    with patch('webdriver_manager.chrome.ChromeDriverManager.install') as mock_install:
+        mock_install.return_value = '/mock/path/to/chromedriver'
+        yield mock_chrome, mock_install, mock_driver
+
+
+# Мокируем psycopg2.connect, чтобы избежать реального подключения к базе данных.
+# Патч устанавливается один раз на сессию; соединение и курсор создаются заново для каждого теста.
+@pytest.fixture(scope="session")
+def _psycopg2_connect_session():
+    """Патчит psycopg2.connect на всю сессию тестов и возвращает его мок."""
+    with patch('psycopg2.connect') as mock_connect:
+        yield mock_connect
+
+
+@pytest.fixture
+def mock_psycopg2_connect(_psycopg2_connect_session):
+    """Фикстура для мокирования psycopg2.connect и его зависимостей.
+
+    Долгоживущий мок connect только очищается от вызовов прошлых тестов: reset_mock(side_effect=True)
+    сбросил бы и сравнение `==` у дочерних моков, поэтому соединение и курсор каждый раз новые.
+    """
+    mock_connect = _psycopg2_connect_session
+    mock_connect.reset_mock()
+    mock_connect.side_effect = None
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 1
+    mock_conn.closed = False # Пул соединений проверяет этот атрибут при возврате соединения
+    mock_conn.cursor.return_value = mock_cursor
+    mock_connect.return_value = mock_conn
+    return mock_connect, mock_conn, mock_cursor
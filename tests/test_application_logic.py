@@ -0,0 +1,250 @@
+import datetime
+import json
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from core.application_logic import ApplicationLogic
+from database.db_manager import DBManager
+from scraper.arbitr_scraper import ArbitrScraper
+from psycopg2 import OperationalError
+from selenium.common.exceptions import TimeoutException
+
+VALID_INN = "7707083893"
+
+
+def make_cases(count, prefix='A40'):
+    """Создает список фиктивных дел с уникальными номерами."""
+    return [{'case_number': f'{prefix}-{i}/2023', 'case_date': None, 'inn': VALID_INN} for i in range(count)]
+
+
+def scrape_yielding(cases, error=None):
+    """Возвращает side_effect для scrape_arbitr_cases, передающий дела в on_case по одному.
+
+    Args:
+        cases (list): Дела, которые "находит" скрапер.
+        error (Exception, optional): Исключение, выбрасываемое после передачи всех дел.
+    """
+    def scrape(inn, on_case=None):
+        for case in cases:
+            on_case(case)
+        if error is not None:
+            raise error
+        return list(cases)
+    return scrape
+
+
+@pytest.fixture
+def logic_parts():
+    """Фикстура для создания ApplicationLogic с замокированными скрапером, БД и GUI."""
+    mock_scraper = Mock(spec=ArbitrScraper)
+    mock_db_manager = Mock(spec=DBManager)
+    # По умолчанию БД "вставляет" все переданные дела
+    mock_db_manager.insert_cases_bulk.side_effect = len
+    statuses = []
+    batches = []
+    results = []
+    logic = ApplicationLogic(
+        scraper=mock_scraper,
+        db_manager=mock_db_manager,
+        gui_status_updater=statuses.append,
+        gui_results_updater=results.append,
+        gui_cases_appender=batches.append
+    )
+    return logic, mock_scraper, mock_db_manager, statuses, batches, results
+
+
+class TestApplicationLogicScraping:
+    """Набор тестов потоковой обработки дел в ApplicationLogic.start_scraping."""
+
+    def test_cases_saved_in_batches(self, logic_parts):
+        """Проверяет, что дела сохраняются и выводятся в GUI пачками по save_batch_size."""
+        logic, mock_scraper, mock_db_manager, statuses, batches, _ = logic_parts
+        cases = make_cases(logic.save_batch_size * 2 + 20)
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape_yielding(cases)
+
+        logic.start_scraping(VALID_INN)
+
+        saved_sizes = [len(call.args[0]) for call in mock_db_manager.insert_cases_bulk.call_args_list]
+        assert saved_sizes == [50, 50, 20]
+        assert [len(batch) for batch in batches] == [50, 50, 20]
+        assert [case for batch in batches for case in batch] == cases
+        assert f"Успешно вставлено {len(cases)} новых дел (пропущены существующие)." in statuses
+
+    def test_cases_found_before_scraper_error_are_saved(self, logic_parts):
+        """Проверяет, что дела, найденные до ошибки скрапера, все равно сохраняются в БД."""
+        logic, mock_scraper, mock_db_manager, statuses, batches, _ = logic_parts
+        cases = make_cases(3)
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape_yielding(cases, error=TimeoutException("Timed out"))
+
+        logic.start_scraping(VALID_INN)
+
+        mock_db_manager.insert_cases_bulk.assert_called_once_with(cases)
+        assert batches == [cases]
+        assert any("Сайт недоступен" in status for status in statuses)
+        assert "Успешно вставлено 3 новых дел (пропущены существующие)." in statuses
+
+    @pytest.mark.parametrize("db_behaviour", [
+        pytest.param({'side_effect': None, 'return_value': None}, id="insert_returns_none"),
+        pytest.param({'side_effect': OperationalError("connection refused")}, id="operational_error"),
+    ])
+    def test_db_error_is_reported(self, logic_parts, db_behaviour):
+        """Проверяет, что ошибка сохранения в БД сообщается в статусе GUI."""
+        logic, mock_scraper, mock_db_manager, statuses, _, _ = logic_parts
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape_yielding(make_cases(2))
+        mock_db_manager.insert_cases_bulk.configure_mock(**db_behaviour)
+
+        logic.start_scraping(VALID_INN)
+
+        assert "Часть дел не удалось сохранить в базу данных. Подробности в журнале." in statuses
+        assert not any(status.startswith("Успешно вставлено") for status in statuses)
+
+    def test_saving_does_not_block_scraping(self, logic_parts):
+        """Проверяет, что скрапер продолжает работу, пока предыдущая пачка сохраняется в БД."""
+        logic, mock_scraper, mock_db_manager, statuses, _, _ = logic_parts
+        logic.save_batch_size = 2
+        scraping_done = threading.Event()
+
+        def slow_insert(batch):
+            # Первая пачка "сохраняется", пока скрапер не передаст все дела
+            if not scraping_done.wait(timeout=5):
+                raise AssertionError("Скрапинг ждал сохранения пачки в БД")
+            return len(batch)
+        mock_db_manager.insert_cases_bulk.side_effect = slow_insert
+
+        def scrape(inn, on_case=None):
+            scrape_yielding(make_cases(4))(inn, on_case)
+            scraping_done.set()
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape
+
+        logic.start_scraping(VALID_INN)
+
+        assert mock_db_manager.insert_cases_bulk.call_count == 2
+        assert "Успешно вставлено 4 новых дел (пропущены существующие)." in statuses
+
+    def test_repeated_cases_saved_and_emitted_once(self, logic_parts):
+        """Проверяет, что повторы одного дела от скрапера сохраняются и выводятся в GUI один раз."""
+        logic, mock_scraper, mock_db_manager, statuses, batches, _ = logic_parts
+        cases = make_cases(3)
+        # Повторы внутри пачки и на границе пачек сохранения
+        logic.save_batch_size = 2
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape_yielding(
+            [cases[0], cases[0], cases[1], cases[0], cases[2], cases[1], cases[2]]
+        )
+
+        logic.start_scraping(VALID_INN)
+
+        saved = [case for call in mock_db_manager.insert_cases_bulk.call_args_list for case in call.args[0]]
+        assert saved == cases
+        assert [case for batch in batches for case in batch] == cases
+        assert f"Скрапинг завершен. Найдено 3 дел для ИНН {VALID_INN}." in statuses
+
+    def test_without_cases_appender_results_updated_once(self, logic_parts):
+        """Проверяет, что без вывода пачками таблица GUI обновляется одним списком в конце."""
+        _, mock_scraper, mock_db_manager, statuses, _, results = logic_parts
+        logic = ApplicationLogic(
+            scraper=mock_scraper,
+            db_manager=mock_db_manager,
+            gui_status_updater=statuses.append,
+            gui_results_updater=results.append
+        )
+        cases = make_cases(3)
+        mock_scraper.scrape_arbitr_cases.side_effect = scrape_yielding(cases)
+
+        logic.start_scraping(VALID_INN)
+
+        assert results == [cases]
+        mock_db_manager.insert_cases_bulk.assert_called_once_with(cases)
+
+
+class TestInnValidation:
+    """Набор тестов проверки ИНН в ApplicationLogic._is_valid_inn."""
+
+    @pytest.mark.parametrize("inn, expected", [
+        pytest.param("7707083893", True, id="valid_10"),
+        pytest.param("7736207543", True, id="valid_10_second"),
+        pytest.param("7707083894", False, id="invalid_10_checksum"),
+        pytest.param("500100732259", True, id="valid_12"),
+        pytest.param("500053218999", True, id="valid_12_second"),
+        pytest.param("500100732250", False, id="invalid_12_last_digit"),
+        pytest.param("500100732219", False, id="invalid_12_eleventh_digit"),
+        pytest.param("770708389", False, id="too_short"),
+        pytest.param("77070838931", False, id="eleven_digits"),
+        pytest.param("5001007322590", False, id="too_long"),
+        pytest.param("٧٧٠٧٠٨٣٨٩٣", False, id="non_ascii_digits"),
+        pytest.param("７７０７０８３８９３", False, id="fullwidth_digits"),
+        pytest.param("7707083893\n", False, id="trailing_newline"),
+        pytest.param("77070838a3", False, id="letter"),
+        pytest.param("", False, id="empty"),
+        pytest.param(None, False, id="none"),
+    ])
+    def test_is_valid_inn(self, inn, expected):
+        """Проверяет формат и контрольные цифры ИНН."""
+        assert ApplicationLogic._is_valid_inn(inn) is expected
+
+    def test_invalid_inn_does_not_start_scraping(self, logic_parts):
+        """Проверяет, что при неверной контрольной цифре скрапинг не запускается."""
+        logic, mock_scraper, _, statuses, _, _ = logic_parts
+        logic.start_scraping("7707083894")
+        mock_scraper.scrape_arbitr_cases.assert_not_called()
+        assert any("Неверный ИНН" in status for status in statuses)
+
+    def test_empty_inn_reports_single_error(self, logic_parts):
+        """Проверяет, что пустой ИНН отклоняется одним сообщением об ошибке без запуска скрапинга."""
+        logic, mock_scraper, _, statuses, _, _ = logic_parts
+        logic.start_scraping("")
+        mock_scraper.scrape_arbitr_cases.assert_not_called()
+        assert len(statuses) == 1
+        assert "Неверный ИНН" in statuses[0]
+
+
+class TestFilterCases:
+    """Набор тестов фильтрации сохраненных дел в ApplicationLogic.filter_cases."""
+
+    def test_filter_cases_passes_dates_to_db(self, logic_parts):
+        """Проверяет, что фильтры передаются в БД с датами datetime.date, а результат - в таблицу GUI."""
+        logic, _, mock_db_manager, _, _, results = logic_parts
+        filtered = [{'case_number': 'TEST_CASE-1', 'case_date': datetime.date(2023, 5, 1), 'inn': '1234567890'}]
+        mock_db_manager.get_filtered_cases_as_dicts.return_value = filtered
+
+        logic.filter_cases(case_number_filter="TEST_CASE", inn_filter="123",
+                           start_date="2023-01-01", end_date="2023-12-31")
+
+        mock_db_manager.get_filtered_cases_as_dicts.assert_called_once_with(
+            "TEST_CASE", "123", datetime.date(2023, 1, 1), datetime.date(2023, 12, 31)
+        )
+        assert results == [filtered]
+
+
+class TestExport:
+    """Набор тестов экспорта сохраненных дел в ApplicationLogic."""
+
+    @pytest.mark.parametrize("export_method, file_name", [
+        pytest.param("export_data_to_csv", "test.csv", id="csv"),
+        pytest.param("export_data_to_json", "test.json", id="json"),
+    ])
+    def test_export_empty_table(self, logic_parts, tmp_path, export_method, file_name):
+        """Проверяет, что при пустой таблице экспорт завершается без создания файла."""
+        logic, _, mock_db_manager, statuses, _, _ = logic_parts
+        mock_db_manager.iter_all_cases.return_value = (row for row in ())
+        file_path = tmp_path / file_name
+
+        assert getattr(logic, export_method)(str(file_path)) is False
+        assert not file_path.exists()
+        assert any(status.startswith("Нет данных для экспорта") for status in statuses)
+
+    @pytest.mark.parametrize("export_method, file_name, read_exported, expected", [
+        pytest.param("export_data_to_csv", "test.csv", str.splitlines,
+                     ["case_number,case_date,inn", "A40-1/2023,2023-01-15,7707083893"], id="csv"),
+        pytest.param("export_data_to_json", "test.json", json.loads,
+                     [{'case_number': 'A40-1/2023', 'case_date': '2023-01-15', 'inn': '7707083893'}], id="json"),
+    ])
+    def test_export(self, logic_parts, tmp_path, export_method, file_name, read_exported, expected):
+        """Проверяет экспорт сохраненных дел в CSV и JSON."""
+        logic, _, mock_db_manager, _, _, _ = logic_parts
+        mock_db_manager.iter_all_cases.return_value = (row for row in [('A40-1/2023', datetime.date(2023, 1, 15), '7707083893')])
+        file_path = tmp_path / file_name
+
+        assert getattr(logic, export_method)(str(file_path)) is True
+        assert read_exported(file_path.read_text(encoding='utf-8')) == expected
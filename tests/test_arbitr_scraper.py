@@ -1,52 +1,34 @@
-
 import pytest
 from unittest.mock import patch, MagicMock
-import os
-import sys
-import configparser
-
-# Корректировка пути Python для возможности импорта модулей из структуры проекта.
-# Предполагается, что каталог тестов находится по адресу arbitration_checker/tests.
-project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root_path not in sys.path:
-    sys.path.insert(0, project_root_path)
+import datetime
+from types import SimpleNamespace
 
-from scraper.arbitr_scraper import ArbitrScraper
+from scraper.arbitr_scraper import ArbitrScraper, _parse_ru_date, _SET_INPUT_VALUE_JS, _NO_RESULTS_SELECTOR
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 @pytest.fixture
-def mock_webdriver_components():
-    """Фикстура для мокирования компонентов WebDriver Selenium.
+def api_unavailable():
+    """Фикстура, имитирующая недоступность JSON API, чтобы скрапер перешел на Selenium."""
+    with patch.object(ArbitrScraper, '_scrape_via_api', return_value=None) as mock_api:
+        yield mock_api
 
-    Мокирует `selenium.webdriver.Chrome`
-    и возвращает фиктивный объект драйвера.
-    """
-    with patch('selenium.webdriver.Chrome') as mock_chrome:
-        with patch('webdriver_manager.chrome.ChromeDriverManager.install') as mock_install:
-            mock_driver = MagicMock()
-            mock_chrome.return_value = mock_driver
-            mock_install.return_value = '/mock/path/to/chromedriver'
-            yield mock_chrome, mock_install, mock_driver
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def scraper_instance():
-    """Фикстура для создания экземпляра ArbitrScraper с фиктивным файлом настроек.
+    """Фикстура для создания экземпляра ArbitrScraper с тестовой конфигурацией.
 
-    Создает временный `settings.ini` для изоляции тестов.
+    Конфигурация передается словарем, без файла настроек. Экземпляр создается
+    один раз на модуль; WebDriver между тестами сбрасывает `reset_scraper_state`.
     """
-    # Создаем фиктивный settings.ini для целей тестирования
-    test_settings_dir = os.path.join(project_root_path, '..')
-    os.makedirs(test_settings_dir, exist_ok=True)
-    test_settings_path = os.path.join(test_settings_dir, 'test_settings.ini')
-    with open(test_settings_path, 'w') as f:
-        f.write("""[SELENIUM]webdriver_path = /mock/path/to/chromedriver""")
-
-    scraper = ArbitrScraper(config_path=test_settings_path)
-    yield scraper
-    # Удаляем фиктивный settings.ini
-    os.remove(test_settings_path)
-    os.rmdir(test_settings_dir) # Удаляем каталог, если он пуст
+    yield ArbitrScraper(config={'SELENIUM': {'webdriver_path': '/mock/path/to/chromedriver'}})
+
+@pytest.fixture(autouse=True)
+def reset_scraper_state(scraper_instance):
+    """Сбрасывает WebDriver и Service общего экземпляра ArbitrScraper после каждого теста."""
+    yield
+    scraper_instance.driver = None
+    scraper_instance._service = None
 
 class TestArbitrScraper:
     """Набор тестов для класса ArbitrScraper."""
@@ -56,11 +38,24 @@ class TestArbitrScraper:
         mock_chrome, mock_install, mock_driver = mock_webdriver_components
         scraper_instance._initialize_webdriver()
         mock_install.assert_called_once() # Проверяем, что install был вызван
-        # Проверяем, что Chrome был вызван с экземпляром Options.
-        # Используем mock.ANY для соответствия любому экземпляру Options.
-        mock_chrome.assert_called_once_with(options=MagicMock(spec=Options))
+        # Проверяем, что Chrome был вызван с экземплярами Options и Service
+        mock_chrome.assert_called_once()
+        chrome_kwargs = mock_chrome.call_args.kwargs
+        assert isinstance(chrome_kwargs['options'], Options)
+        assert isinstance(chrome_kwargs['service'], Service)
+        assert chrome_kwargs['service'].path == '/mock/path/to/chromedriver'
         assert scraper_instance.driver == mock_driver
 
+    def test_initialize_webdriver_reuses_service(self, mock_webdriver_components, scraper_instance):
+        """Тестирует, что chromedriver ищется один раз, а Service переиспользуется."""
+        mock_chrome, mock_install, _ = mock_webdriver_components
+        scraper_instance._initialize_webdriver()
+        scraper_instance.close()
+        scraper_instance._initialize_webdriver()
+        mock_install.assert_called_once()
+        first_service = mock_chrome.call_args_list[0].kwargs['service']
+        assert mock_chrome.call_args_list[1].kwargs['service'] is first_service
+
     def test_initialize_webdriver_failure(self, mock_webdriver_components, scraper_instance):
         """Тестирует неудачную инициализацию WebDriver."""
         mock_chrome, mock_install, _ = mock_webdriver_components
@@ -68,74 +63,197 @@ class TestArbitrScraper:
         scraper_instance._initialize_webdriver()
         assert scraper_instance.driver is None # Драйвер должен быть None при ошибке
 
-    def test_scrape_arbitr_cases_success(self, mock_webdriver_components, scraper_instance):
+    def test_scrape_arbitr_cases_success(self, mock_chrome_only, scraper_instance, api_unavailable):
         """Тестирует успешное скрапинг арбитражных дел."""
-        mock_chrome, _, mock_driver = mock_webdriver_components
+        mock_chrome, mock_driver = mock_chrome_only
 
         # Симулируем успешную инициализацию веб-драйвера внутри scrape_arbitr_cases
         scraper_instance.driver = mock_driver
 
-        # Мокируем элементы WebDriver и их поведение
-        mock_inn_input = MagicMock()
-        mock_inn_input.send_keys.return_value = None
-        mock_search_button = MagicMock()
-        mock_search_button.click.return_value = None
+        # Элементы страницы только передаются в execute_script, поэтому вместо MagicMock
+        # достаточно легковесных заглушек
+        mock_inn_input = SimpleNamespace()
+        mock_search_button = SimpleNamespace()
+
+        # Мокируем WebDriverWait: ожидания по очереди возвращают поле ИНН, кнопку и строки результатов
+        with patch('scraper.arbitr_scraper.WebDriverWait') as mock_wait:
+            # Симулируем строки результата, прочитанные одним вызовом execute_script
+            mock_driver.execute_script.side_effect = [
+                None,                                # ввод ИНН
+                None,                                # нажатие кнопки 'Найти'
+                [['A123-45/2023', '01.01.2023']]     # номер и дата дела (скрипт уже ограничил max_results)
+            ]
 
-        # Мокируем WebDriverWait и EC (Expected Conditions)
-        with patch('selenium.webdriver.support.ui.WebDriverWait') as mock_wait,              patch('selenium.webdriver.support.expected_conditions') as mock_ec:
             mock_wait.return_value.until.side_effect = [
                 mock_inn_input,      # для EC.presence_of_element_located поля ввода ИНН
                 mock_search_button,  # для EC.element_to_be_clickable кнопки поиска
-                None                 # для EC.presence_of_element_located блока результатов
-            ]
-
-            # Симулируем строку результата
-            mock_row1 = MagicMock()
-            mock_row1.find_element.side_effect = [
-                MagicMock(text='A123-45/2023'), # элемент номера дела
-                MagicMock(text='01.01.2023')   # элемент даты дела
+                [SimpleNamespace()]  # для EC.presence_of_all_elements_located строк результатов
             ]
 
-            mock_driver.find_elements.return_value = [mock_row1] # Возвращаем одну мокированную строку
-
             cases = scraper_instance.scrape_arbitr_cases("1234567890", max_results=1)
 
             assert len(cases) == 1
             assert cases[0]['case_number'] == 'A123-45/2023'
-            assert cases[0]['case_date'] == '2023-01-01'
+            assert cases[0]['case_date'] == datetime.date(2023, 1, 1)
             assert cases[0]['inn'] == '1234567890'
             mock_driver.get.assert_called_once_with(scraper_instance.base_url)
-            mock_inn_input.send_keys.assert_called_once_with("1234567890")
-            mock_search_button.click.assert_called_once()
-            mock_driver.quit.assert_called_once()
+            mock_driver.execute_script.assert_any_call(_SET_INPUT_VALUE_JS, mock_inn_input, "1234567890")
+            mock_driver.execute_script.assert_any_call("arguments[0].click();", mock_search_button)
+            assert mock_driver.execute_script.call_count == 3 # Ввод ИНН, клик и одно чтение всех строк
+            assert mock_driver.execute_script.call_args.args[1] == 1 # Лимит строк передается в скрипт
+            mock_driver.quit.assert_not_called() # Драйвер переиспользуется между вызовами
 
-    def test_scrape_arbitr_cases_no_results(self, mock_webdriver_components, scraper_instance):
+    def test_scrape_arbitr_cases_no_results(self, mock_chrome_only, scraper_instance, api_unavailable):
         """Тестирует скрапинг при отсутствии результатов."""
-        mock_chrome, _, mock_driver = mock_webdriver_components
+        mock_chrome, mock_driver = mock_chrome_only
         scraper_instance.driver = mock_driver
 
-        mock_inn_input = MagicMock()
-        mock_search_button = MagicMock()
+        mock_inn_input = SimpleNamespace()
+        mock_search_button = SimpleNamespace()
 
-        with patch('selenium.webdriver.support.ui.WebDriverWait') as mock_wait,              patch('selenium.webdriver.support.expected_conditions') as mock_ec:
+        with patch('scraper.arbitr_scraper.WebDriverWait') as mock_wait:
             mock_wait.return_value.until.side_effect = [
                 mock_inn_input,
                 mock_search_button,
-                None
+                TimeoutException("No rows") # Симулируем отсутствие строк результатов
             ]
-            mock_driver.find_elements.return_value = [] # Симулируем отсутствие строк результатов
 
             cases = scraper_instance.scrape_arbitr_cases("1111111111")
             assert len(cases) == 0
-            mock_driver.quit.assert_called_once()
+            mock_driver.quit.assert_not_called() # Драйвер переиспользуется между вызовами
+
+    def test_scrape_arbitr_cases_no_results_message(self, mock_chrome_only, scraper_instance, api_unavailable):
+        """Тестирует, что сообщение 'ничего не найдено' завершает ожидание результатов без таймаута."""
+        _, mock_driver = mock_chrome_only
+        scraper_instance.driver = mock_driver
+        mock_driver.execute_script.side_effect = [None, None, []] # Ввод ИНН, клик, пустая таблица
+
+        # Страница без строк с делами, но с видимым сообщением об отсутствии результатов
+        no_results_message = MagicMock()
+        no_results_message.is_displayed.return_value = True
+        mock_driver.find_elements.return_value = []
 
-    def test_scrape_arbitr_cases_timeout(self, mock_webdriver_components, scraper_instance):
+        def find_element(by, selector):
+            if selector == _NO_RESULTS_SELECTOR:
+                return no_results_message
+            raise NoSuchElementException(selector)
+        mock_driver.find_element.side_effect = find_element
+
+        waits = iter([SimpleNamespace(), SimpleNamespace()]) # Поле ИНН и кнопка 'Найти'
+        results_wait = []
+
+        def until(condition):
+            element = next(waits, None)
+            if element is None:
+                # Условие ожидания результатов проверяется на странице без дел
+                element = condition(mock_driver)
+                results_wait.append(element)
+            return element
+
+        with patch('scraper.arbitr_scraper.WebDriverWait') as mock_wait:
+            mock_wait.return_value.until.side_effect = until
+            cases = scraper_instance.scrape_arbitr_cases("1111111111")
+
+        assert cases == []
+        assert results_wait == [no_results_message] # Ожидание выполнено сообщением, а не таймаутом
+        assert mock_driver.execute_script.call_count == 3 # Таблица прочитана сразу, без таймаута
+
+    def test_scrape_arbitr_cases_timeout(self, mock_chrome_only, scraper_instance, api_unavailable):
         """Тестирует скрапинг при возникновении таймаута."""
-        mock_chrome, _, mock_driver = mock_webdriver_components
+        mock_chrome, mock_driver = mock_chrome_only
         scraper_instance.driver = mock_driver
 
-        with patch('selenium.webdriver.support.ui.WebDriverWait') as mock_wait,              patch('selenium.webdriver.support.expected_conditions') as mock_ec:
+        with patch('scraper.arbitr_scraper.WebDriverWait') as mock_wait:
             mock_wait.return_value.until.side_effect = TimeoutException("Timed out") # Симулируем таймаут
             cases = scraper_instance.scrape_arbitr_cases("1234567890")
             assert len(cases) == 0
-            mock_driver.quit.assert_called_once()
+            mock_driver.quit.assert_not_called() # Драйвер переиспользуется между вызовами
+
+    def test_scrape_via_api_success(self, mock_chrome_only, scraper_instance):
+        """Тестирует получение дел через JSON API без запуска WebDriver."""
+        mock_chrome, _ = mock_chrome_only
+        mock_response = MagicMock(status_code=200, ok=True, headers={'Content-Type': 'application/json; charset=utf-8'})
+        mock_response.json.return_value = {'Result': {'Items': [
+            {'CaseNumber': 'А40-1/2023', 'Date': '/Date(1672531200000)/'},
+            {'CaseNumber': 'А40-2/2023', 'Date': '2023-02-01T00:00:00'},
+        ]}}
+        found = []
+        with patch.object(scraper_instance.session, 'post', return_value=mock_response) as mock_post:
+            cases = scraper_instance.scrape_arbitr_cases("7707083893", max_results=10, on_case=found.append)
+
+        assert cases == [
+            {'case_number': 'А40-1/2023', 'case_date': datetime.date(2023, 1, 1), 'inn': '7707083893'},
+            {'case_number': 'А40-2/2023', 'case_date': datetime.date(2023, 2, 1), 'inn': '7707083893'},
+        ]
+        assert found == cases
+        assert mock_post.call_args.kwargs['json']['Sides'][0]['Name'] == "7707083893"
+        mock_chrome.assert_not_called()
+
+    @pytest.mark.parametrize("value, expected", [
+        pytest.param('/Date(1672520400000+0300)/', datetime.date(2023, 1, 1), id="moscow_midnight_with_offset"),
+        pytest.param('/Date(1672520400000)/', datetime.date(2023, 1, 1), id="moscow_midnight_no_offset"),
+        pytest.param('/Date(1672545600000-0500)/', datetime.date(2022, 12, 31), id="negative_offset"),
+        pytest.param('2023-02-01T00:00:00', datetime.date(2023, 2, 1), id="iso"),
+        pytest.param(None, None, id="empty"),
+        pytest.param('не дата', None, id="invalid"),
+    ])
+    def test_parse_api_date(self, value, expected):
+        """Тестирует разбор дат JSON API с учетом часового пояса (21:00 UTC - уже следующий день в Москве)."""
+        assert ArbitrScraper._parse_api_date(value) == expected
+
+    def test_scrape_via_api_captcha_falls_back(self, scraper_instance):
+        """Тестирует переход на Selenium, если JSON API отвечает 403."""
+        mock_response = MagicMock(status_code=403, ok=False, headers={'Content-Type': 'text/html'})
+        with patch.object(scraper_instance.session, 'post', return_value=mock_response), \
+             patch.object(ArbitrScraper, '_scrape_via_selenium', return_value=[]) as mock_selenium:
+            assert scraper_instance.scrape_arbitr_cases("7707083893") == []
+        mock_selenium.assert_called_once_with("7707083893", 10, None)
+
+    @pytest.mark.parametrize("items", [
+        pytest.param(None, id="items_null"),
+        pytest.param(['А40-1/2023'], id="items_not_objects"),
+    ])
+    def test_scrape_via_api_malformed_items_falls_back(self, scraper_instance, items):
+        """Тестирует переход на Selenium, если JSON API вернуло поврежденный список дел."""
+        mock_response = MagicMock(status_code=200, ok=True, headers={'Content-Type': 'application/json'})
+        mock_response.json.return_value = {'Result': {'Items': items}}
+        with patch.object(scraper_instance.session, 'post', return_value=mock_response), \
+             patch.object(ArbitrScraper, '_scrape_via_selenium', return_value=[]) as mock_selenium:
+            assert scraper_instance.scrape_arbitr_cases("7707083893") == []
+        mock_selenium.assert_called_once_with("7707083893", 10, None)
+
+    def test_close_quits_driver(self, mock_chrome_only, scraper_instance):
+        """Тестирует, что close закрывает переиспользуемый WebDriver."""
+        _, mock_driver = mock_chrome_only
+        scraper_instance.driver = mock_driver
+        scraper_instance.close()
+        mock_driver.quit.assert_called_once()
+        assert scraper_instance.driver is None
+
+    def test_parse_ru_date(self):
+        """Тестирует разбор даты 'дд.мм.гггг' быстрым путем и через запасной strptime."""
+        assert _parse_ru_date("15.01.2023") == datetime.date(2023, 1, 15)
+        assert _parse_ru_date("5.1.2023") == datetime.date(2023, 1, 5)
+        with pytest.raises(ValueError):
+            _parse_ru_date("31.02.2023")
+        with pytest.raises(ValueError):
+            _parse_ru_date("не дата")
+
+    def test_context_manager_closes_driver(self, mock_chrome_only, scraper_instance):
+        """Тестирует, что выход из блока `with` закрывает WebDriver."""
+        _, mock_driver = mock_chrome_only
+        with scraper_instance as scraper:
+            scraper.driver = mock_driver
+        mock_driver.quit.assert_called_once()
+        assert scraper_instance.driver is None
+
+    def test_config_file_cache_is_not_shared(self, tmp_path):
+        """Тестирует, что экземпляры с одним файлом настроек получают независимые копии конфигурации."""
+        config_path = tmp_path / "settings.ini"
+        config_path.write_text("[SELENIUM]\nwebdriver_path = /path/to/chromedriver\n", encoding='utf-8')
+        first = ArbitrScraper(config_path=str(config_path))
+        second = ArbitrScraper(config_path=str(config_path))
+
+        first.config.set('SELENIUM', 'webdriver_path', '/changed')
+        assert second.config is not first.config
+        assert second.config.get('SELENIUM', 'webdriver_path') == '/path/to/chromedriver'
@@ -1,70 +1,46 @@
-
 import pytest
 from unittest.mock import patch, MagicMock
-import os
-import sys
 import configparser
 import psycopg2
+import datetime
+import threading
+import time
 
-# Корректировка пути Python для возможности импорта модулей из структуры проекта.
-# Предполагается, что каталог tests находится по адресу arbitration_checker/tests.
-project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root_path not in sys.path:
-    sys.path.insert(0, project_root_path)
-
-from database.db_manager import DBManager
+from database.db_manager import DBManager, DbConfig, PREPARE_STATEMENTS_SQL
+from psycopg2.extras import RealDictCursor
 
-# Мокируем psycopg2.connect, чтобы избежать реального подключения к базе данных
-@pytest.fixture
-def mock_psycopg2_connect():
-    """Фикстура для мокирования psycopg2.connect и его зависимостей."""
-    with patch('psycopg2.connect') as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
-        yield mock_connect, mock_conn, mock_cursor
+# Ожидаемые запросы, которые DBManager выполняет через подготовленные операторы
+EXPECTED_INSERT_QUERY = "EXECUTE insert_case_stmt (%s, %s, %s);"
+EXPECTED_CASE_EXISTS_QUERY = "EXECUTE case_exists_stmt (%s);"
 
 @pytest.fixture
 def db_manager_instance():
-    """Фикстура для создания экземпляра DBManager с фиктивным файлом настроек."""
-    # Создать фиктивный settings.ini для целей тестирования
-    test_settings_dir = os.path.join(project_root_path, 'core')
-    os.makedirs(test_settings_dir, exist_ok=True)
-    test_settings_path = os.path.join(test_settings_dir, 'test_settings.ini')
-    with open(test_settings_path, 'w') as f:
-        f.write("""
-[DATABASE]
-host = test_host
-port = 5432
-dbname = test_db
-user = test_user
-password = test_password
-""")
-
-    manager = DBManager(config_path=test_settings_path)
-    yield manager
-    # Очистить фиктивный settings.ini
-    os.remove(test_settings_path)
-    os.rmdir(test_settings_dir) # Удаляем каталог, если он пуст
-
-
-@pytest.fixture
-def mock_sql_script_path():
-    """Фикстура для создания фиктивного SQL-скрипта."""
-    # Создать фиктивный SQL-скрипт для целей тестирования
-    dummy_sql_dir = os.path.join(project_root_path, 'database')
-    os.makedirs(dummy_sql_dir, exist_ok=True)
-    path = os.path.join(dummy_sql_dir, 'test_init_db.sql')
-    with open(path, 'w') as f:
-        f.write("CREATE TABLE test_table (id INT);")
-    yield path
-    os.remove(path)
-    os.rmdir(dummy_sql_dir) # Удаляем каталог, если он пуст
+    """Фикстура для создания экземпляра DBManager с тестовой конфигурацией, переданной словарем."""
+    return DBManager(config={'DATABASE': {
+        'host': 'test_host',
+        'port': '5432',
+        'dbname': 'test_db',
+        'user': 'test_user',
+        'password': 'test_password',
+    }})
+
+@pytest.fixture(scope="module")
+def mock_sql_script_path(tmp_path_factory):
+    """Фикстура для создания фиктивного SQL-скрипта во временном каталоге pytest."""
+    path = tmp_path_factory.mktemp("sql") / "test_init_db.sql"
+    path.write_text("CREATE TABLE test_table (id INT);")
+    return str(path)
 
 class TestDBManager:
     """Набор тестов для класса DBManager."""
 
+    def test_db_config_defaults(self):
+        """Проверяет значения по умолчанию при отсутствии секции [DATABASE]."""
+        db_config = DbConfig.from_config(configparser.ConfigParser())
+        assert db_config.connection_kwargs() == {
+            'host': 'localhost', 'port': '5432', 'database': 'arbitration_db', 'user': 'postgres', 'password': ''
+        }
+
     def test_get_connection_success(self, mock_psycopg2_connect, db_manager_instance):
         """Проверяет успешное получение соединения с базой данных."""
         mock_connect, mock_conn, _ = mock_psycopg2_connect
@@ -81,6 +57,43 @@ class TestDBManager:
         conn = db_manager_instance._get_connection()
         assert conn is None
 
+    def test_get_connection_reuses_pool(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что возвращенное в пул соединение переиспользуется без нового подключения."""
+        mock_connect, mock_conn, _ = mock_psycopg2_connect
+        conn = db_manager_instance._get_connection()
+        db_manager_instance._put_connection(conn)
+        assert db_manager_instance._get_connection() == mock_conn
+        mock_connect.assert_called_once()
+
+    def test_get_connection_creates_pool_once_concurrently(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что при одновременном первом обращении из нескольких потоков создается один пул."""
+        created = []
+
+        def slow_pool(*args, **kwargs):
+            time.sleep(0.05) # Окно, в которое другие потоки успевают проверить self._pool
+            pool = MagicMock(closed=False)
+            created.append(pool)
+            return pool
+
+        with patch('database.db_manager.ThreadedConnectionPool', side_effect=slow_pool):
+            threads = [threading.Thread(target=db_manager_instance._get_connection) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(created) == 1
+        assert created[0].getconn.call_count == 5
+
+    def test_close_closes_pool(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что close закрывает соединения пула."""
+        _, mock_conn, _ = mock_psycopg2_connect
+        conn = db_manager_instance._get_connection()
+        db_manager_instance._put_connection(conn)
+        db_manager_instance.close()
+        mock_conn.close.assert_called_once()
+        assert db_manager_instance._pool is None
+
     def test_create_table(self, mock_psycopg2_connect, db_manager_instance, mock_sql_script_path):
         """Проверяет создание таблицы с использованием SQL-скрипта."""
         _, mock_conn, mock_cursor = mock_psycopg2_connect
@@ -89,18 +102,36 @@ class TestDBManager:
         mock_cursor.execute.assert_called_once_with("CREATE TABLE test_table (id INT);")
         mock_conn.commit.assert_called_once()
 
+    def test_create_table_runs_once(self, mock_psycopg2_connect, db_manager_instance, mock_sql_script_path):
+        """Проверяет, что после успешного создания таблицы скрипт повторно не выполняется."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        assert db_manager_instance.create_table(sql_script_path=mock_sql_script_path) is True
+        assert db_manager_instance.create_table(sql_script_path=mock_sql_script_path) is True
+        mock_cursor.execute.assert_called_once()
+
+    def test_create_table_trgm_failure_keeps_table(self, mock_psycopg2_connect, db_manager_instance, tmp_path):
+        """Проверяет, что ошибка создания pg_trgm не мешает созданию таблицы."""
+        _, mock_conn, mock_cursor = mock_psycopg2_connect
+        sql_script_path = tmp_path / "init_db.sql"
+        sql_script_path.write_text("CREATE TABLE test_table (id INT);")
+        (tmp_path / "init_trgm.sql").write_text("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        mock_cursor.execute.side_effect = [None, psycopg2.errors.InsufficientPrivilege("permission denied")]
+
+        # Возврат в пул подменен, чтобы учитывать только откат, выполненный create_table
+        with patch.object(db_manager_instance, '_put_connection'):
+            assert db_manager_instance.create_table(sql_script_path=str(sql_script_path)) is True
+        assert mock_cursor.execute.call_args_list[1].args == ("CREATE EXTENSION IF NOT EXISTS pg_trgm;",)
+        mock_conn.commit.assert_called_once() # Зафиксирована только транзакция создания таблицы
+        mock_conn.rollback.assert_called_once()
+
     def test_insert_case_new(self, mock_psycopg2_connect, db_manager_instance):
         """Проверяет вставку нового дела в базу данных."""
         _, mock_conn, mock_cursor = mock_psycopg2_connect
         mock_cursor.rowcount = 1 # Симулируем новую вставку
         result = db_manager_instance.insert_case('CASE-001', '2023-01-15', '1234567890')
         assert result is True
-        insert_query = """
-                    INSERT INTO arbitration_cases (case_number, case_date, inn)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (case_number) DO NOTHING;
-                """.strip().replace('                    ', '') # Нормализация пробелов для сравнения
-        mock_cursor.execute.assert_called_once_with(insert_query, ('CASE-001', '2023-01-15', '1234567890'))
+        mock_cursor.execute.assert_any_call(PREPARE_STATEMENTS_SQL)
+        mock_cursor.execute.assert_called_with(EXPECTED_INSERT_QUERY, ('CASE-001', '2023-01-15', '1234567890'))
         mock_conn.commit.assert_called_once()
 
     def test_insert_case_duplicate(self, mock_psycopg2_connect, db_manager_instance):
@@ -111,13 +142,59 @@ class TestDBManager:
         assert result is True # Метод возвращает True, даже если пропущен из-за корректной обработки
         mock_conn.commit.assert_called_once()
 
+    def test_insert_cases_bulk(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет пакетную вставку дел одним запросом и одним коммитом."""
+        _, mock_conn, mock_cursor = mock_psycopg2_connect
+        cases = [
+            {'case_number': 'CASE-001', 'case_date': '2023-01-15', 'inn': '1234567890'},
+            {'case_number': 'CASE-002', 'case_date': '2023-01-16', 'inn': '1234567890'},
+        ]
+        with patch('database.db_manager.execute_values', return_value=[('CASE-002',)]) as mock_execute_values:
+            result = db_manager_instance.insert_cases_bulk(cases)
+        assert result == 1 # CASE-001 уже существовал
+        mock_execute_values.assert_called_once()
+        _, _, rows = mock_execute_values.call_args.args
+        assert rows == [('CASE-001', '2023-01-15', '1234567890'), ('CASE-002', '2023-01-16', '1234567890')]
+        mock_conn.commit.assert_called_once()
+
+    def test_insert_cases_bulk_empty(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что пустой список не приводит к обращению к базе данных."""
+        mock_connect, _, _ = mock_psycopg2_connect
+        assert db_manager_instance.insert_cases_bulk([]) == 0
+        mock_connect.assert_not_called()
+
     def test_case_exists_true(self, mock_psycopg2_connect, db_manager_instance):
         """Проверяет, что case_exists возвращает True, если дело существует."""
         _, _, mock_cursor = mock_psycopg2_connect
         mock_cursor.fetchone.return_value = (1,) # Симулируем найденное дело
         result = db_manager_instance.case_exists('CASE-001')
         assert result is True
-        mock_cursor.execute.assert_called_once_with("SELECT 1 FROM arbitration_cases WHERE case_number = %s;", ('CASE-001',))
+        mock_cursor.execute.assert_called_with(EXPECTED_CASE_EXISTS_QUERY, ('CASE-001',))
+
+    def test_case_exists_cached_after_insert(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что после вставки case_exists отвечает из кэша без запроса к БД."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        mock_cursor.rowcount = 1
+        db_manager_instance.insert_case('CASE-001', '2023-01-15', '1234567890')
+        mock_cursor.execute.reset_mock()
+        assert db_manager_instance.case_exists('CASE-001') is True
+        mock_cursor.execute.assert_not_called()
+
+    def test_case_exists_false_not_cached(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что отрицательный ответ не кэшируется."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        mock_cursor.fetchone.side_effect = [None, (1,)]
+        assert db_manager_instance.case_exists('CASE-001') is False
+        assert db_manager_instance.case_exists('CASE-001') is True
+
+    def test_statements_prepared_once_per_connection(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что PREPARE выполняется один раз для переиспользуемого соединения пула."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        mock_cursor.fetchone.return_value = None
+        db_manager_instance.case_exists('CASE-001')
+        db_manager_instance.case_exists('CASE-002')
+        prepare_calls = [c for c in mock_cursor.execute.call_args_list if c.args[0] == PREPARE_STATEMENTS_SQL]
+        assert len(prepare_calls) == 1
 
     def test_case_exists_false(self, mock_psycopg2_connect, db_manager_instance):
         """Проверяет, что case_exists возвращает False, если дело не существует."""
@@ -135,3 +212,43 @@ class TestDBManager:
         assert cases[0] == ('CASE-001', '2023-01-15', '1234567890')
         mock_cursor.execute.assert_called_once_with("SELECT case_number, case_date, inn FROM arbitration_cases;")
 
+
+    def test_iter_all_cases(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет потоковое чтение дел через именованный (серверный) курсор."""
+        _, mock_conn, mock_cursor = mock_psycopg2_connect
+        rows = [('CASE-001', '2023-01-15', '1234567890'), ('CASE-002', '2023-01-16', '0987654321')]
+        mock_cursor.__iter__.return_value = iter(rows)
+        assert list(db_manager_instance.iter_all_cases(batch_size=50)) == rows
+        mock_conn.cursor.assert_called_once_with(name='cases_stream')
+        assert mock_cursor.itersize == 50
+        mock_cursor.close.assert_called_once()
+
+    def test_get_all_cases_as_dicts(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что словари строк строятся курсором RealDictCursor."""
+        _, mock_conn, mock_cursor = mock_psycopg2_connect
+        rows = [{'case_number': 'CASE-001', 'case_date': '2023-01-15', 'inn': '1234567890'}]
+        mock_cursor.fetchall.return_value = rows
+        assert db_manager_instance.get_all_cases_as_dicts() == rows
+        mock_conn.cursor.assert_called_once_with(cursor_factory=RealDictCursor)
+
+    def test_get_filtered_cases_only_used_predicates(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что в запрос попадают только заданные условия, а даты передаются как date."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        mock_cursor.fetchall.return_value = []
+        start_date = datetime.date(2023, 1, 1)
+        db_manager_instance.get_filtered_cases_as_dicts(inn_filter='123', start_date=start_date)
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT case_number, case_date, inn FROM arbitration_cases WHERE inn ILIKE %s AND case_date >= %s;",
+            ('%123%', start_date)
+        )
+
+    def test_get_filtered_cases_exact_inn(self, mock_psycopg2_connect, db_manager_instance):
+        """Проверяет, что полный ИНН ищется точным совпадением, а не по подстроке."""
+        _, _, mock_cursor = mock_psycopg2_connect
+        mock_cursor.fetchall.return_value = []
+        end_date = datetime.date(2023, 12, 31)
+        db_manager_instance.get_filtered_cases_as_dicts(inn_filter='7707083893', end_date=end_date)
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT case_number, case_date, inn FROM arbitration_cases WHERE inn = %s AND case_date <= %s;",
+            ('7707083893', end_date)
+        )
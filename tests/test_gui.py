@@ -1,256 +1,190 @@
-
 import pytest
-from unittest.mock import MagicMock, patch
-import os
-import sys
-
-# Динамически добавляем корень проекта в sys.path для импортов
-current_script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root_path = os.path.abspath(os.path.join(current_script_dir, '..'))
-
-if project_root_path not in sys.path:
-    sys.path.insert(0, project_root_path)
+from unittest.mock import Mock, ANY
+import datetime
 
-# Мокируем QApplication перед импортом MainWindow, если запускаемся в безголовой среде без дисплея.
-# Мы будем использовать фикстуру для управления жизненным циклом QApplication.
-
-# Убедитесь, что PyQt5.QtWidgets импортирован только после настройки путей
-from PyQt5.QtWidgets import QApplication, QTextEdit # Добавлен QTextEdit для мокирования
-from gui.main_window import MainWindow
 from core.application_logic import ApplicationLogic
-
-# Фикстура для QApplication. Мы хотим избежать создания нескольких QApplications.
-@pytest.fixture(scope="session")
-def qapp():
-    """Фикстура для создания QApplication для тестов GUI."""
-    app = QApplication(sys.argv)
-    yield app
-    # Нет необходимости вызывать app.exec_() для модульных тестов, достаточно простого создания.
-
-@pytest.fixture
-def main_window(qapp): # qapp как зависимость, чтобы QApplication был инициализирован
-    """Фикстура для создания экземпляра MainWindow с замокированными зависимостями."""
-    with patch('scraper.arbitr_scraper.ArbitrScraper') as MockArbitrScraper,
-         patch('database.db_manager.DBManager') as MockDBManager,
-         patch('core.application_logic.ApplicationLogic') as MockApplicationLogic:
-
-        mock_scraper_instance = MockArbitrScraper.return_value
-        mock_db_manager_instance = MockDBManager.return_value
-        mock_application_logic_instance = MockApplicationLogic.return_value
-
-        window = MainWindow()
-        # Вручную настраиваем логику приложения после создания окна, если это необходимо для тестов
-        # Для этих базовых тестов мы проверяем только элементы GUI, а не полную интеграцию логики
-
-        yield window, mock_scraper_instance, mock_db_manager_instance, mock_application_logic_instance
+from database.db_manager import DBManager
+from scraper.arbitr_scraper import ArbitrScraper
+
+# Все тесты модуля требуют Qt и pytest-qt и по умолчанию исключены маркером `gui` (см. pytest.ini).
+# PyQt5 и MainWindow импортируются внутри фикстур и тестов, чтобы Qt не загружался при сборке тестов.
+pytestmark = pytest.mark.gui
+
+@pytest.fixture(scope="module")
+def main_window(qapp): # qapp (pytest-qt) как зависимость, чтобы QApplication был инициализирован
+    """Фикстура для создания экземпляра MainWindow с замокированными зависимостями.
+
+    Окно создается один раз на модуль; состояние виджетов и моков между тестами
+    сбрасывает фикстура `_reset_widgets`. Функциональный `qtbot.addWidget` здесь
+    неприменим, поэтому окно удаляется явно с обработкой отложенных событий.
+    """
+    # MainWindow не создает скрапер и менеджер БД сам, поэтому модули не патчатся;
+    # ApplicationLogic для тестов строит фикстура `window_logic`. Моки создаются один раз
+    # и сбрасываются через reset_mock() в `_reset_widgets`
+    mock_scraper_instance = Mock(spec=ArbitrScraper)
+    mock_db_manager_instance = Mock(spec=DBManager)
+
+    from gui.main_window import MainWindow
+
+    window = MainWindow()
+    yield window, mock_scraper_instance, mock_db_manager_instance
     window.close()
+    window.deleteLater()
+    qapp.processEvents()
+
+@pytest.fixture(autouse=True)
+def _reset_widgets(main_window):
+    """Очищает поля ввода, таблицу, статус и моки общего окна перед каждым тестом."""
+    window, mock_scraper, mock_db_manager = main_window
+    for line_edit in (window.scrape_inn_input, window.case_num_filter_input, window.inn_filter_input,
+                      window.start_date_input, window.end_date_input):
+        line_edit.clear()
+    window.clear_results_table()
+    window._pending_status.clear()
+    window.status_display.clear()
+    for mock in (mock_scraper, mock_db_manager):
+        mock.reset_mock(return_value=True, side_effect=True)
+    yield
+
+@pytest.fixture(scope="module")
+def window_logic(main_window):
+    """ApplicationLogic, подключенная к общему окну так же, как в main.py.
+
+    Тесты вызывают методы логики напрямую, без переподключения сигналов кнопок.
+    """
+    window, mock_scraper, mock_db_manager = main_window
+    return ApplicationLogic(
+        scraper=mock_scraper,
+        db_manager=mock_db_manager,
+        gui_status_updater=window.append_status,
+        gui_results_updater=window.update_results_table,
+        gui_cases_appender=window.add_cases_to_table
+    )
 
 
 class TestMainWindow:
     """Набор тестов для класса MainWindow."""
 
-    def test_window_title(self, main_window):
-        """Проверяет заголовок окна."""
-        window, _, _, _ = main_window
-        assert window.windowTitle() == "Arbitration Checker"
-
-    def test_inn_input_presence(self, main_window):
-        """Проверяет наличие поля ввода ИНН."""
-        window, _, _, _ = main_window
-        assert window.scrape_inn_input is not None
-        assert isinstance(window.scrape_inn_input, type(window.scrape_inn_input))
-        assert window.scrape_inn_input.placeholderText() == "Введите ИНН для скрапинга"
-
-    def test_search_button_presence(self, main_window):
-        """Проверяет наличие кнопки поиска."""
-        window, _, _, _ = main_window
-        assert window.search_button is not None
-        assert isinstance(window.search_button, type(window.search_button))
-        assert window.search_button.text() == "Найти (Скрапинг)"
-
-    def test_filter_controls_presence(self, main_window):
-        """Проверяет наличие элементов управления фильтрацией."""
-        window, _, _, _ = main_window
-        assert window.case_num_filter_input is not None
-        assert window.inn_filter_input is not None
-        assert window.start_date_input is not None
-        assert window.end_date_input is not None
-        assert window.filter_button is not None
-        assert window.filter_button.text() == "Фильтровать (Поиск сохраненных)"
-
-    def test_export_buttons_presence(self, main_window):
-        """Проверяет наличие кнопок экспорта."""
-        window, _, _, _ = main_window
-        assert window.export_csv_button is not None
-        assert window.export_csv_button.text() == "Экспорт в CSV"
-        assert window.export_json_button is not None
-        assert window.export_json_button.text() == "Экспорт в JSON"
-
-    def test_results_table_presence(self, main_window):
-        """Проверяет наличие таблицы результатов."""
-        window, _, _, _ = main_window
-        assert window.results_table is not None
-        assert isinstance(window.results_table, type(window.results_table))
-        assert window.results_table.columnCount() == 3
-        assert window.results_table.horizontalHeaderItem(0).text() == 'Номер дела'
-        assert window.results_table.horizontalHeaderItem(1).text() == 'Дата дела'
-        assert window.results_table.horizontalHeaderItem(2).text() == 'ИНН'
-
-    def test_status_display_presence(self, main_window):
-        """Проверяет наличие области отображения статуса."""
-        window, _, _, _ = main_window
-        assert window.status_display is not None
-        assert isinstance(window.status_display, QTextEdit) # Явно проверяем тип QTextEdit
-        assert window.status_display.isReadOnly() is True
-
-    def test_search_button_click_updates_status(self, qapp, main_window):
-        """Проверяет, что нажатие кнопки поиска вызывает соответствующую логику."""
-        window, mock_scraper, mock_db_manager, mock_application_logic = main_window
-
-        # Мокируем метод start_scraping логики приложения
-        mock_application_logic.start_scraping = MagicMock()
-
-        # Инициализируем ApplicationLogic для окна (как это делает main.py)
-        window_logic = ApplicationLogic(
-            scraper=mock_scraper,
-            db_manager=mock_db_manager,
-            gui_status_updater=window.status_display.append,
-            gui_results_updater=window.update_results_table
-        )
-
-        # Переподключаем кнопку к нашей замокированной логике через экземпляр ApplicationLogic
-        try:
-            window.search_button.clicked.disconnect() # Отключаем существующие соединения
-        except TypeError: # Сигнал не имеет подключенных слотов
-            pass
-        window.search_button.clicked.connect(
-            lambda: window_logic.start_scraping(window.scrape_inn_input.text())
-        )
-
-        # Устанавливаем фиктивный ИНН
-        test_inn = "1234567890"
-        window.scrape_inn_input.setText(test_inn)
-
-        # Нажимаем кнопку поиска
-        window.search_button.click()
-
-        # Проверяем, что start_scraping был вызван с правильным ИНН
-        mock_application_logic.start_scraping.assert_called_once_with(test_inn)
-
-
-    def test_search_button_click_no_inn(self, qapp, main_window):
-        """Проверяет поведение кнопки поиска при отсутствии введенного ИНН."""
-        window, mock_scraper, mock_db_manager, mock_application_logic = main_window
-
-        mock_application_logic.start_scraping = MagicMock()
-
-        window_logic = ApplicationLogic(
-            scraper=mock_scraper,
-            db_manager=mock_db_manager,
-            gui_status_updater=window.status_display.append,
-            gui_results_updater=window.update_results_table
-        )
-        try:
-            window.search_button.clicked.disconnect()
-        except TypeError:
-            pass
-        window.search_button.clicked.connect(
-            lambda: window_logic.start_scraping(window.scrape_inn_input.text())
-        )
-
+    @pytest.mark.parametrize("check", [
+        pytest.param(lambda w: w.windowTitle() == "Arbitration Checker", id="window_title"),
+        pytest.param(lambda w: w.scrape_inn_input.inherits('QLineEdit')
+                     and w.scrape_inn_input.placeholderText() == "Введите ИНН для скрапинга", id="inn_input"),
+        pytest.param(lambda w: w.search_button.inherits('QPushButton')
+                     and w.search_button.text() == "Найти (Скрапинг)", id="search_button"),
+        pytest.param(lambda w: all(field.inherits('QLineEdit') for field in (
+                         w.case_num_filter_input, w.inn_filter_input, w.start_date_input, w.end_date_input))
+                     and w.filter_button.text() == "Фильтровать (Поиск сохраненных)", id="filter_controls"),
+        pytest.param(lambda w: w.export_csv_button.text() == "Экспорт в CSV"
+                     and w.export_json_button.text() == "Экспорт в JSON", id="export_buttons"),
+        pytest.param(lambda w: w.results_table.inherits('QTableView')
+                     and w.results_table.model().columnCount() == 3
+                     and [w.results_table.model().headerData(i, w.results_table.horizontalHeader().orientation()) for i in range(3)]
+                     == ['Номер дела', 'Дата дела', 'ИНН'], id="results_table"),
+        pytest.param(lambda w: w.status_display.inherits('QTextEdit')
+                     and w.status_display.isReadOnly(), id="status_display"),
+    ])
+    def test_widget_presence(self, main_window, check):
+        """Проверяет наличие и начальное состояние виджетов главного окна."""
+        window, _, _ = main_window
+        assert check(window)
+
+    def test_update_results_table(self, main_window):
+        """Проверяет, что таблица результатов отображает переданные дела."""
+        window, _, _ = main_window
+        window.update_results_table([
+            {'case_number': 'A40-1/2023', 'case_date': datetime.date(2023, 1, 15), 'inn': '7707083893'},
+            {'case_number': 'A40-2/2023', 'case_date': None, 'inn': '7707083893'},
+        ])
+        model = window.results_table.model()
+        assert model.rowCount() == 2
+        assert model.data(model.index(0, 0)) == 'A40-1/2023'
+        assert model.data(model.index(0, 1)) == '2023-01-15'
+        assert model.data(model.index(1, 1)) == ''
+        window.clear_results_table()
+        assert model.rowCount() == 0
+
+    def test_add_cases_to_table_single_insert(self, main_window):
+        """Проверяет, что пачка дел добавляется одной операцией вставки строк."""
+        window, _, _ = main_window
+        model = window.results_table.model()
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        window.add_cases_to_table([
+            {'case_number': f'A40-{i}/2023', 'case_date': None, 'inn': '7707083893'} for i in range(3)
+        ])
+        assert inserted == [(0, 2)]
+        assert model.rowCount() == 3
+
+    def test_results_model_pagination(self, main_window):
+        """Проверяет, что модель отдает дела представлению страницами по PAGE_SIZE."""
+        from PyQt5.QtCore import QModelIndex
+
+        window, _, _ = main_window
+        model = window.results_model
+        total = model.PAGE_SIZE * 2 + 50
+        model.set_cases([
+            {'case_number': f'A40-{i}/2023', 'case_date': None, 'inn': '7707083893'} for i in range(total)
+        ])
+        assert model.rowCount() == model.PAGE_SIZE
+        assert model.canFetchMore(QModelIndex())
+        model.fetchMore(QModelIndex())
+        model.fetchMore(QModelIndex())
+        assert model.rowCount() == total
+        assert not model.canFetchMore(QModelIndex())
+        assert model.data(model.index(total - 1, 0)) == f'A40-{total - 1}/2023'
+
+    def test_status_messages_are_buffered(self, main_window, qtbot):
+        """Проверяет, что сообщения статуса выводятся одной пачкой по таймеру."""
+        window, _, _ = main_window
+        window.status_message.emit("Первое сообщение")
+        window.status_message.emit("Второе сообщение")
+        assert window.status_display.toPlainText() == ''
+        qtbot.waitUntil(lambda: window.status_display.toPlainText() == "Первое сообщение\nВторое сообщение")
+
+    def test_button_handlers_use_status_buffer(self, main_window, qtbot):
+        """Проверяет, что обработчики кнопок выводят статус через буфер append_status."""
+        window, _, _ = main_window
         window.scrape_inn_input.setText("")
-        window.search_button.click()
-
-        # Убеждаемся, что start_scraping НЕ был вызван, и статус-дисплей был обновлен сообщением об ошибке
-        mock_application_logic.start_scraping.assert_not_called()
-        # Проверка фактического текста в status_display выполняется в полноценном GUI-тесте.
-        # На данный момент достаточна проверка того, что start_scraping не был вызван.
-
-    def test_filter_button_click(self, qapp, main_window):
-        """Проверяет, что нажатие кнопки фильтрации вызывает соответствующую логику."""
-        window, mock_scraper, mock_db_manager, mock_application_logic = main_window
-        mock_application_logic.filter_cases = MagicMock()
-
-        window_logic = ApplicationLogic(
-            scraper=mock_scraper,
-            db_manager=mock_db_manager,
-            gui_status_updater=window.status_display.append,
-            gui_results_updater=window.update_results_table
-        )
-
-        try:
-            window.filter_button.clicked.disconnect()
-        except TypeError:
-            pass
-        window.filter_button.clicked.connect(
-            lambda: window_logic.filter_cases(
-                case_number_filter=window.case_num_filter_input.text(),
-                inn_filter=window.inn_filter_input.text(),
-                start_date=window.start_date_input.text(),
-                end_date=window.end_date_input.text()
-            )
-        )
-
-        window.case_num_filter_input.setText("TEST_CASE")
-        window.inn_filter_input.setText("123")
-        window.start_date_input.setText("2023-01-01")
-        window.end_date_input.setText("2023-12-31")
-
-        window.filter_button.click()
-
-        mock_application_logic.filter_cases.assert_called_once_with(
-            case_number_filter="TEST_CASE",
-            inn_filter="123",
-            start_date="2023-01-01",
-            end_date="2023-12-31"
-        )
-
-    def test_export_csv_button_click(self, qapp, main_window):
-        """Проверяет, что нажатие кнопки экспорта в CSV вызывает соответствующую логику."""
-        window, mock_scraper, mock_db_manager, mock_application_logic = main_window
-        mock_application_logic.export_data_to_csv = MagicMock(return_value=True) # Мокируем, что экспорт успешен
-
-        window_logic = ApplicationLogic(
-            scraper=mock_scraper,
-            db_manager=mock_db_manager,
-            gui_status_updater=window.status_display.append,
-            gui_results_updater=window.update_results_table
-        )
-
-        try:
-            window.export_csv_button.clicked.disconnect()
-        except TypeError:
-            pass
-
-        with patch('PyQt5.QtWidgets.QFileDialog.getSaveFileName', return_value=('/path/to/test.csv', "CSV Files (*.csv)")): # Мокируем выбор файла
-            window.export_csv_button.clicked.connect(lambda: window_logic.export_data_to_csv(
-                QFileDialog.getSaveFileName(window, "Export CSV", "cases.csv", "CSV Files (*.csv)")[0]
-            ))
-            window.export_csv_button.click()
-
-        mock_application_logic.export_data_to_csv.assert_called_once_with("/path/to/test.csv")
+        window._on_search_clicked()
+        assert window.status_display.toPlainText() == ''
+        qtbot.waitUntil(lambda: window.status_display.toPlainText() == "Пожалуйста, введите ИНН для скрапинга.")
+
+    def test_cases_found_signal_appends_rows(self, main_window):
+        """Проверяет, что сигнал cases_found добавляет пачку найденных дел в таблицу."""
+        window, _, _ = main_window
+        window.cases_found.emit([
+            {'case_number': 'A40-1/2023', 'case_date': None, 'inn': '7707083893'},
+            {'case_number': 'A40-2/2023', 'case_date': None, 'inn': '7707083893'},
+        ])
+        model = window.results_table.model()
+        assert model.rowCount() == 2
+        assert model.data(model.index(1, 0)) == 'A40-2/2023'
+
+    def test_search_button_click_updates_status(self, main_window, qtbot):
+        """Проверяет, что нажатие кнопки поиска обрабатывается окном (интеграционный тест нажатия)."""
+        from PyQt5.QtCore import Qt
+
+        window, _, _ = main_window
+        window.scrape_inn_input.setText("7707083893")
+        qtbot.mouseClick(window.search_button, Qt.LeftButton)
+        qtbot.waitUntil(lambda: "Поиск дел для ИНН: 7707083893..." in window.status_display.toPlainText())
+
+    def test_start_scraping_with_inn_input(self, main_window, window_logic):
+        """Проверяет, что скрапинг запускается для ИНН из поля ввода."""
+        window, mock_scraper, _ = main_window
+        test_inn = "7707083893"
+        window.scrape_inn_input.setText(test_inn)
 
-    def test_export_json_button_click(self, qapp, main_window):
-        """Проверяет, что нажатие кнопки экспорта в JSON вызывает соответствующую логику."""
-        window, mock_scraper, mock_db_manager, mock_application_logic = main_window
-        mock_application_logic.export_data_to_json = MagicMock(return_value=True) # Мокируем, что экспорт успешен
+        window_logic.start_scraping(window.scrape_inn_input.text())
 
-        window_logic = ApplicationLogic(
-            scraper=mock_scraper,
-            db_manager=mock_db_manager,
-            gui_status_updater=window.status_display.append,
-            gui_results_updater=window.update_results_table
-        )
+        mock_scraper.scrape_arbitr_cases.assert_called_once_with(test_inn, on_case=ANY)
 
-        try:
-            window.export_json_button.clicked.disconnect()
-        except TypeError:
-            pass
+    def test_start_scraping_no_inn(self, main_window, window_logic):
+        """Проверяет, что без введенного ИНН скрапинг не запускается, а в статус выводится ошибка."""
+        window, mock_scraper, _ = main_window
 
-        with patch('PyQt5.QtWidgets.QFileDialog.getSaveFileName', return_value=('/path/to/test.json', "JSON Files (*.json)")): # Мокируем выбор файла
-            window.export_json_button.clicked.connect(lambda: window_logic.export_data_to_json(
-                QFileDialog.getSaveFileName(window, "Export JSON", "cases.json", "JSON Files (*.json)")[0]
-            ))
-            window.export_json_button.click()
+        window_logic.start_scraping(window.scrape_inn_input.text())
 
-        mock_application_logic.export_data_to_json.assert_called_once_with("/path/to/test.json")
+        mock_scraper.scrape_arbitr_cases.assert_not_called()
+        window._flush_status()
+        assert "Неверный ИНН" in window.status_display.toPlainText()
@@ -0,0 +1,89 @@
+import pytest
+import logging
+
+from utils.logger import _BufferedRotatingFileHandler
+
+
+def make_record(message, level=logging.INFO):
+    """Создает запись лога с заданным сообщением и уровнем."""
+    return logging.makeLogRecord({'msg': message, 'levelno': level, 'levelname': logging.getLevelName(level)})
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Путь к файлу логов во временном каталоге pytest."""
+    return tmp_path / "test.log"
+
+
+@pytest.fixture
+def make_handler(log_path):
+    """Фабрика обработчиков; все созданные обработчики закрываются после теста."""
+    handlers = []
+
+    def factory(**kwargs):
+        kwargs.setdefault('encoding', 'utf-8')
+        kwargs.setdefault('delay', True)
+        handler = _BufferedRotatingFileHandler(str(log_path), **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handlers.append(handler)
+        return handler
+
+    yield factory
+    for handler in handlers:
+        handler.close()
+
+
+class TestBufferedRotatingFileHandler:
+    """Набор тестов для обработчика _BufferedRotatingFileHandler."""
+
+    def test_info_buffered_until_error(self, make_handler, log_path):
+        """Проверяет, что INFO остается в буфере, а ERROR сбрасывает буфер на диск."""
+        handler = make_handler()
+        handler.handle(make_record("информация"))
+        assert log_path.read_bytes() == b''
+
+        handler.handle(make_record("ошибка", logging.ERROR))
+        assert log_path.read_text(encoding='utf-8').splitlines() == ["информация", "ошибка"]
+
+    def test_close_flushes_buffer(self, make_handler, log_path):
+        """Проверяет, что закрытие обработчика записывает буфер в файл."""
+        handler = make_handler()
+        handler.handle(make_record("последнее сообщение"))
+        handler.close()
+        assert log_path.read_text(encoding='utf-8').splitlines() == ["последнее сообщение"]
+
+    def test_flush_writes_buffer(self, make_handler, log_path):
+        """Проверяет, что явный flush записывает буфер в файл без закрытия."""
+        handler = make_handler()
+        handler.handle(make_record("сообщение"))
+        handler.flush()
+        assert log_path.read_text(encoding='utf-8').splitlines() == ["сообщение"]
+
+    def test_size_counter_matches_file(self, make_handler, log_path):
+        """Проверяет, что счетчик размера совпадает с размером файла, в том числе для кириллицы."""
+        log_path.write_bytes(b'existing\n')
+        handler = make_handler()
+        for i in range(5):
+            handler.handle(make_record(f"дело А40-{i}/2023"))
+        handler.flush()
+        assert handler._file_size == log_path.stat().st_size
+
+    def test_rollover(self, make_handler, log_path):
+        """Проверяет ротацию файла по размеру и ограничение числа архивов."""
+        handler = make_handler(maxBytes=100, backupCount=2)
+        messages = [f"сообщение {i:02d}" for i in range(30)]
+        for message in messages:
+            handler.handle(make_record(message))
+        handler.close()
+
+        backups = [log_path.with_name(f"{log_path.name}.{i}") for i in (1, 2)]
+        assert all(path.exists() for path in backups)
+        assert not log_path.with_name(f"{log_path.name}.3").exists()
+        # Файл ротируется до записи сообщения, которое не помещается в maxBytes
+        for path in [log_path, *backups]:
+            assert 0 < path.stat().st_size < 100
+        # Последние сообщения сохраняются по порядку: старый архив, новый архив, текущий файл
+        kept = []
+        for path in [backups[1], backups[0], log_path]:
+            kept.extend(path.read_text(encoding='utf-8').splitlines())
+        assert kept == messages[-len(kept):]
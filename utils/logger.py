@@ -1,6 +1,118 @@
+"""Настройка логирования приложения.
+
+Формат записей не использует сведения о потоке и процессе, поэтому setup_logging
+отключает их сбор в LogRecord. Отладочные сообщения с дорогими аргументами
+в часто вызываемом коде следует защищать проверкой уровня:
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Вставлено дело: {case_number}")
+"""
 
 import logging
+import logging.handlers
 import os
+import time
+
+# Корневая директория проекта (logger.py находится в arbitration_checker/utils)
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Логгер, настроенный первым вызовом setup_logging; последующие вызовы возвращают его сразу
+_LOGGER = None
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Форматировщик, который вызывает time.strftime не чаще раза в секунду.
+
+    Формат времени совпадает со стандартным для `%(asctime)s`: 'ГГГГ-ММ-ДД ЧЧ:ММ:СС,ммм'.
+    """
+    def __init__(self, fmt=None):
+        """Инициализирует форматировщик.
+
+        Args:
+            fmt (str, optional): Строка формата записи.
+        """
+        super().__init__(fmt)
+        # Пара (секунда, отформатированная строка) читается и заменяется целиком,
+        # поэтому обработчики в разных потоках не увидят секунду от одной записи, а строку от другой
+        self._cached_second = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        """Возвращает время записи, переиспользуя отформатированную часть до секунд."""
+        second = int(record.created)
+        cached_second, second_str = self._cached_second
+        if second != cached_second:
+            second_str = time.strftime('%Y-%m-%d %H:%M:%S', self.converter(record.created))
+            self._cached_second = (second, second_str)
+        return f"{second_str},{int(record.msecs):03d}"
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler с блочной записью в файл.
+
+    Стандартный обработчик сбрасывает буфер файла после каждой записи, а проверка
+    размера для ротации (seek/tell) сбрасывает его еще раз. Здесь файл открывается
+    в двоичном режиме, каждое сообщение кодируется один раз, а размер файла
+    отслеживается по длине записанных байт. Буфер сбрасывается только после
+    сообщений уровня `flush_level` и выше, при ротации и при закрытии обработчика
+    (logging.shutdown при завершении программы).
+    """
+    def __init__(self, *args, flush_level=logging.WARNING, **kwargs):
+        """Инициализирует обработчик.
+
+        Args:
+            *args: Позиционные аргументы RotatingFileHandler.
+            flush_level (int, optional): Минимальный уровень сообщения, после которого буфер
+                                         сбрасывается на диск. По умолчанию logging.WARNING.
+            **kwargs: Именованные аргументы RotatingFileHandler.
+        """
+        self._file_size = 0
+        self.flush_level = flush_level
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        """Открывает файл логов в двоичном режиме дозаписи и запоминает его текущий размер."""
+        stream = open(self.baseFilename, 'ab')
+        self._file_size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def _encode(self, record):
+        """Форматирует сообщение и кодирует его в байты для записи в файл."""
+        msg = self.format(record) + self.terminator
+        if os.linesep != '\n':
+            # Двоичный поток не переводит концы строк, как текстовый в Windows
+            msg = msg.replace('\n', os.linesep)
+        return msg.encode(self.encoding or 'utf-8', self.errors or 'strict')
+
+    def _needs_rollover(self, data_size):
+        """Проверяет, превысит ли запись `data_size` байт предел maxBytes.
+
+        Как и в RotatingFileHandler, ротация выполняется до записи сообщения, которое
+        не помещается в файл; пустой файл не ротируется, даже если сообщение больше предела.
+        """
+        return self.maxBytes > 0 and self._file_size > 0 and self._file_size + data_size >= self.maxBytes
+
+    def shouldRollover(self, record):
+        """Определяет необходимость ротации по счетчику размера, не обращаясь к файлу."""
+        if self.stream is None:
+            self.stream = self._open()
+        return self._needs_rollover(len(self._encode(record)))
+
+    def emit(self, record):
+        """Записывает сообщение в буфер файла, при необходимости выполняя ротацию."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            data = self._encode(record)
+            if self._needs_rollover(len(data)):
+                self.doRollover()
+                if self.stream is None: # При delay=True doRollover не открывает новый файл
+                    self.stream = self._open()
+            self.stream.write(data)
+            self._file_size += len(data)
+            if record.levelno >= self.flush_level:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 def setup_logging(log_file_name='app.log', log_level=logging.INFO):
     """Настраивает систему логирования для вывода в файл и консоль.
@@ -8,6 +120,7 @@ def setup_logging(log_file_name='app.log', log_level=logging.INFO):
     Логирование производится в файл `app.log` в корневой директории проекта
     и в стандартный вывод (консоль). Файловый лог записывает все сообщения
     уровня DEBUG и выше, консольный лог - сообщения, начиная с заданного `log_level`.
+    Запись в файл буферизуется; при превышении 5 МБ файл ротируется (хранятся 3 архива).
 
     Args:
         log_file_name (str, optional): Имя файла логов. По умолчанию 'app.log'.
@@ -17,22 +130,29 @@ def setup_logging(log_file_name='app.log', log_level=logging.INFO):
     Returns:
         logging.Logger: Настроенный экземпляр логгера.
     """
+    global _LOGGER
+    # Логгер уже настроен: параметры повторных вызовов не применяются, как и раньше
+    if _LOGGER is not None:
+        return _LOGGER
 
-    # Получаем путь к корневой директории проекта. Предполагается, что logger.py
-    # находится в arbitration_checker/utils.
-    project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-
-    # Определяем путь к файлу логов
-    log_file_path = os.path.join(project_root_path, log_file_name)
+    # Определяем путь к файлу логов в корневой директории проекта
+    log_file_path = os.path.join(_PROJECT_ROOT, log_file_name)
 
     # Создаем экземпляр логгера
     logger = logging.getLogger('arbitration_checker')
+    # Формат не содержит %(thread)s, %(process)s и %(processName)s: не собираем их для каждой записи
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     logger.setLevel(logging.DEBUG) # Логируем все сообщения в лог-файл
 
     # Предотвращаем добавление нескольких обработчиков, если setup_logging вызывается несколько раз
     if not logger.handlers:
-        # Обработчик файлов
-        file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+        # Обработчик файлов: файл открывается при первой записи, его размер ограничен ротацией,
+        # на диск записи уходят блоками, а сообщения WARNING и выше - сразу
+        file_handler = _BufferedRotatingFileHandler(
+            log_file_path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8', delay=True
+        )
         file_handler.setLevel(logging.DEBUG) # Логируем все сообщения в файл
 
         # Консольный обработчик
@@ -40,7 +160,7 @@ def setup_logging(log_file_name='app.log', log_level=logging.INFO):
         console_handler.setLevel(log_level) # Логируем в консоль только сообщения уровня log_level и выше
 
         # Форматировщик
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        formatter = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
         # Добавляем форматировщик к обработчикам
         file_handler.setFormatter(formatter)
@@ -50,18 +170,20 @@ def setup_logging(log_file_name='app.log', log_level=logging.INFO):
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
 
-    # Возвращаем настроенный логгер
+    # Запоминаем и возвращаем настроенный логгер
+    _LOGGER = logger
     return logger
 
 if __name__ == '__main__':
     # Демонстрация функциональности логирования
     my_logger = setup_logging(log_level=logging.DEBUG) # Устанавливаем DEBUG для полной демонстрации
 
-    my_logger.debug("Это отладочное сообщение.")
+    if my_logger.isEnabledFor(logging.DEBUG):
+        my_logger.debug("Это отладочное сообщение.")
     my_logger.info("Это информационное сообщение.")
     my_logger.warning("Это предупреждающее сообщение.")
     my_logger.error("Это сообщение об ошибке.")
     my_logger.critical("Это критическое сообщение.")
 
     print(f"Проверьте 'app.log' в корневой директории проекта для полного вывода логов.")
-    print(f"Расположение файла логов: {os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app.log'))}")
+    print(f"Расположение файла логов: {os.path.join(_PROJECT_ROOT, 'app.log')}")